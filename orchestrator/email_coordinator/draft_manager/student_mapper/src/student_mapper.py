@@ -3,6 +3,7 @@ Student Mapper Service
 Maps email addresses to student names using an Excel lookup table.
 """
 import logging
+import operator
 import os
 from pathlib import Path
 from typing import Dict, Optional
@@ -91,14 +92,16 @@ class StudentMapper:
             name_col = self.config['columns']['name_column']
 
             # Find column indices
-            headers = [cell.value for cell in ws[1]]
-            email_idx = headers.index(email_col) + 1
-            name_idx = headers.index(name_col) + 1
-
-            # Load data (skip header row)
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                email = row[email_idx - 1]
-                name = row[name_idx - 1]
+            rows = ws.iter_rows(values_only=True)
+            headers = {value: idx for idx, value in enumerate(next(rows, ()))}
+            missing = {email_col, name_col} - headers.keys()
+            if missing:
+                raise ValueError(f"Mapping file is missing columns: {sorted(missing)}")
+            get_fields = operator.itemgetter(headers[email_col], headers[name_col])
+
+            # Load data (header row already consumed)
+            for row in rows:
+                email, name = get_fields(row)
 
                 if email and name:
                     # Store with lowercase email for case-insensitive lookup
@@ -262,10 +262,10 @@ class EmailReaderManager:
         output_dir = Path(output_path).parent
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Create workbook and worksheet
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Emails"
+        # Create workbook and worksheet; write-only mode streams rows to
+        # the file instead of holding a full worksheet model in memory
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Emails")
 
         # Write headers
         headers = [
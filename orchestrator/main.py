@@ -47,9 +47,17 @@ class Orchestrator:
     4. Create Drafts → email_coordinator.create_drafts()
     """
     
+    __slots__ = (
+        'config_path', 'config', 'logger', '_base_path',
+        'email_coordinator', 'processing_coordinator',
+        'current_mode', 'batch_size',
+        'email_records', 'grade_records', 'feedback_records'
+    )
+    
     def __init__(self, config_path: str = "config.yaml"):
         """Initialize the Orchestrator."""
         self.config_path = config_path
+        self._base_path = Path(config_path).parent
         self.config = self._load_config(config_path)
         self._setup_logging()
         self._initialize_coordinators()
@@ -113,40 +121,36 @@ class Orchestrator:
             ))
             self.logger.addHandler(fh)
     
+    def _child_config(self, name: str, default: str) -> str:
+        """Resolve a child coordinator's config path, falling back to config.yaml."""
+        child_path = self._base_path / self.config.get('children', {}).get(name, default)
+        config_file = child_path / 'config.yaml'
+        return str(config_file) if config_file.exists() else "config.yaml"
+    
     def _initialize_coordinators(self) -> None:
         """Initialize child coordinators."""
-        children = self.config.get('children', {})
-        base_path = Path(self.config_path).parent
+        self.email_coordinator = None
+        self.processing_coordinator = None
         
         # Initialize Email Coordinator
         if EmailCoordinator is not None:
-            email_path = base_path / children.get('email_coordinator', './email_coordinator')
-            email_config = email_path / 'config.yaml'
             try:
                 self.email_coordinator = EmailCoordinator(
-                    config_path=str(email_config) if email_config.exists() else "config.yaml"
+                    config_path=self._child_config('email_coordinator', './email_coordinator')
                 )
                 self.logger.info("Email Coordinator initialized")
             except Exception as e:
                 self.logger.warning(f"Failed to initialize Email Coordinator: {e}")
-                self.email_coordinator = None
-        else:
-            self.email_coordinator = None
         
         # Initialize Processing Coordinator
         if ProcessingCoordinator is not None:
-            proc_path = base_path / children.get('processing_coordinator', './processing_coordinator')
-            proc_config = proc_path / 'config.yaml'
             try:
                 self.processing_coordinator = ProcessingCoordinator(
-                    config_path=str(proc_config) if proc_config.exists() else "config.yaml"
+                    config_path=self._child_config('processing_coordinator', './processing_coordinator')
                 )
                 self.logger.info("Processing Coordinator initialized")
             except Exception as e:
                 self.logger.warning(f"Failed to initialize Processing Coordinator: {e}")
-                self.processing_coordinator = None
-        else:
-            self.processing_coordinator = None
     
     def set_mode(self, mode: str, batch_size: Optional[int] = None) -> None:
         """Set processing mode."""
@@ -373,22 +377,22 @@ def run_interactive_mode(orchestrator: Orchestrator):
             return
     
     # Main menu loop
+    actions = {
+        '1': orchestrator.step1_search_emails,
+        '2': orchestrator.step2_clone_and_grade,
+        '3': orchestrator.step3_generate_feedback,
+        '4': orchestrator.step4_create_drafts,
+        '5': orchestrator.run_all_steps,
+        '6': orchestrator.reset
+    }
+    
     while True:
         print_main_menu()
         choice = input("  Select option [1-9]: ").strip()
         
-        if choice == '1':
-            orchestrator.step1_search_emails()
-        elif choice == '2':
-            orchestrator.step2_clone_and_grade()
-        elif choice == '3':
-            orchestrator.step3_generate_feedback()
-        elif choice == '4':
-            orchestrator.step4_create_drafts()
-        elif choice == '5':
-            orchestrator.run_all_steps()
-        elif choice == '6':
-            orchestrator.reset()
+        action = actions.get(choice)
+        if action is not None:
+            action()
         elif choice == '7':
             # Return to mode selection
             run_interactive_mode(orchestrator)
@@ -442,16 +446,14 @@ def main():
     if args.mode and args.step:
         orchestrator.set_mode(args.mode, args.batch_size)
         
-        if args.step == '1':
-            orchestrator.step1_search_emails()
-        elif args.step == '2':
-            orchestrator.step2_clone_and_grade()
-        elif args.step == '3':
-            orchestrator.step3_generate_feedback()
-        elif args.step == '4':
-            orchestrator.step4_create_drafts()
-        elif args.step == 'all':
-            orchestrator.run_all_steps()
+        steps = {
+            '1': orchestrator.step1_search_emails,
+            '2': orchestrator.step2_clone_and_grade,
+            '3': orchestrator.step3_generate_feedback,
+            '4': orchestrator.step4_create_drafts,
+            'all': orchestrator.run_all_steps
+        }
+        steps[args.step]()
         
         return 0
     
@@ -45,6 +45,11 @@ class ProcessingCoordinator:
     - full_pipeline: Complete processing workflow
     """
     
+    __slots__ = (
+        'config_path', 'config', 'logger', '_base_path',
+        'grade_manager', 'feedback_manager', '_actions'
+    )
+    
     def __init__(self, config_path: str = "config.yaml"):
         """
         Initialize the Processing Coordinator.
@@ -53,10 +58,17 @@ class ProcessingCoordinator:
             config_path: Path to configuration file
         """
         self.config_path = config_path
+        self._base_path = Path(config_path).parent
         self.config = self._load_config(config_path)
         self._setup_logging()
         self._initialize_child_managers()
         
+        self._actions = {
+            'grade': lambda d: self.grade(d.get('email_records', [])),
+            'feedback': lambda d: self.generate_feedback(d.get('grade_records', [])),
+            'full_pipeline': self._run_full_pipeline
+        }
+        
         self.logger.info("Processing Coordinator initialized")
     
     def _load_config(self, config_path: str) -> Dict[str, Any]:
@@ -110,40 +122,36 @@ class ProcessingCoordinator:
             ch.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
             self.logger.addHandler(ch)
     
+    def _child_config(self, name: str, default: str) -> str:
+        """Resolve a child manager's config path, falling back to config.yaml."""
+        child_path = self._base_path / self.config.get('children', {}).get(name, default)
+        config_file = child_path / 'config.yaml'
+        return str(config_file) if config_file.exists() else "config.yaml"
+    
     def _initialize_child_managers(self) -> None:
         """Initialize child managers."""
-        children_config = self.config.get('children', {})
-        base_path = Path(self.config_path).parent
+        self.grade_manager = None
+        self.feedback_manager = None
         
         # Initialize Grade Manager
         if GradeManagerService is not None:
-            grade_path = base_path / children_config.get('grade_manager', './grade_manager')
-            grade_config = grade_path / 'config.yaml'
             try:
                 self.grade_manager = GradeManagerService(
-                    config_path=str(grade_config) if grade_config.exists() else "config.yaml"
+                    config_path=self._child_config('grade_manager', './grade_manager')
                 )
                 self.logger.info("Grade Manager initialized")
             except Exception as e:
                 self.logger.warning(f"Failed to initialize Grade Manager: {e}")
-                self.grade_manager = None
-        else:
-            self.grade_manager = None
         
         # Initialize Feedback Manager
         if FeedbackManager is not None:
-            feedback_path = base_path / children_config.get('feedback_manager', './feedback_manager')
-            feedback_config = feedback_path / 'config.yaml'
             try:
                 self.feedback_manager = FeedbackManager(
-                    config_path=str(feedback_config) if feedback_config.exists() else "config.yaml"
+                    config_path=self._child_config('feedback_manager', './feedback_manager')
                 )
                 self.logger.info("Feedback Manager initialized")
             except Exception as e:
                 self.logger.warning(f"Failed to initialize Feedback Manager: {e}")
-                self.feedback_manager = None
-        else:
-            self.feedback_manager = None
     
     def grade(self, email_records: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -236,47 +244,41 @@ class ProcessingCoordinator:
             Action-specific result dictionary
         """
         action = input_data.get('action', 'grade')
+        handler = self._actions.get(action)
         
-        if action == 'grade':
-            return self.grade(
-                email_records=input_data.get('email_records', [])
-            )
+        if handler is None:
+            return {
+                'status': 'failed',
+                'error': f'Unknown action: {action}'
+            }
         
-        elif action == 'feedback':
-            return self.generate_feedback(
-                grade_records=input_data.get('grade_records', [])
-            )
+        return handler(input_data)
+    
+    def _run_full_pipeline(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Grade repositories, then generate feedback for the resulting grades."""
+        # Step 1: Grade repositories
+        email_records = input_data.get('email_records', [])
+        grade_result = self.grade(email_records)
         
-        elif action == 'full_pipeline':
-            # Step 1: Grade repositories
-            email_records = input_data.get('email_records', [])
-            grade_result = self.grade(email_records)
-            
-            if grade_result.get('status') == 'failed':
-                return {
-                    'action': 'full_pipeline',
-                    'grade_result': grade_result,
-                    'feedback_result': None,
-                    'status': 'failed',
-                    'error': grade_result.get('error')
-                }
-            
-            # Step 2: Generate feedback
-            grade_records = grade_result.get('grades', [])
-            feedback_result = self.generate_feedback(grade_records)
-            
+        if grade_result.get('status') == 'failed':
             return {
                 'action': 'full_pipeline',
                 'grade_result': grade_result,
-                'feedback_result': feedback_result,
-                'status': 'success' if feedback_result.get('status') == 'success' else 'partial'
-            }
-        
-        else:
-            return {
+                'feedback_result': None,
                 'status': 'failed',
-                'error': f'Unknown action: {action}'
+                'error': grade_result.get('error')
             }
+        
+        # Step 2: Generate feedback
+        grade_records = grade_result.get('grades', [])
+        feedback_result = self.generate_feedback(grade_records)
+        
+        return {
+            'action': 'full_pipeline',
+            'grade_result': grade_result,
+            'feedback_result': feedback_result,
+            'status': 'success' if feedback_result.get('status') == 'success' else 'partial'
+        }
     
     def health_check(self) -> Dict[str, Any]:
         """Check coordinator and child manager health."""
@@ -319,11 +321,16 @@ def main():
     elif args.action == 'grade' and args.input:
         try:
             from openpyxl import load_workbook
-            wb = load_workbook(args.input)
-            ws = wb.active
-            rows = list(ws.iter_rows(values_only=True))
-            headers = rows[0]
-            records = [dict(zip(headers, row)) for row in rows[1:] if any(row)]
+            # Stream rows; read-only workbooks keep a file handle open
+            wb = load_workbook(args.input, read_only=True, data_only=True)
+            try:
+                rows = wb.active.iter_rows(values_only=True)
+                headers = next(rows, None)
+                if headers is None:
+                    raise ValueError("Input file is empty")
+                records = [dict(zip(headers, row)) for row in rows if any(row)]
+            finally:
+                wb.close()
             
             result = coordinator.grade(records)
             print(f"Status: {result.get('status')}")
@@ -4,6 +4,18 @@ import sys
 from pathlib import Path
 from .service import GeminiGeneratorService
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(data) -> str:
+    """Pretty-print data as JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
 
 def main():
     """Standalone execution entry point."""
@@ -55,7 +67,7 @@ def main():
         # Run health check if requested
         if args.health:
             health_status = service.health_check()
-            print(json.dumps(health_status, indent=2))
+            print(_dumps(health_status))
             sys.exit(0 if health_status.get("status") == "healthy" else 1)
 
         # Prepare input data
@@ -1,11 +1,225 @@
 import os
+import re
+import queue
+import atexit
+import copy
+import json
+import math
+import random
 import time
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import logging.handlers
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import yaml
-from dotenv import load_dotenv
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Errors worth another attempt: quota, timeouts, server and network failures
+_RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    ConnectionError,
+    TimeoutError,
+)
+
+# Per-request values in otherwise fixed prompts, e.g. "Student grade: 85/100"
+_SLOT_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+def _templatize(text: str) -> Tuple[str, List[str]]:
+    """Replace numeric slots with positional str.format fields."""
+    slots: List[str] = []
+
+    def to_field(match):
+        slots.append(match.group(0))
+        return f"{{{len(slots) - 1}}}"
+
+    escaped = text.replace('{', '{{').replace('}', '}}')
+    return _SLOT_PATTERN.sub(to_field, escaped), slots
+
+
+# libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+# Parsed configs by SHA-256 of the file contents, least recently used first
+_CONFIG_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_CONFIG_CACHE_SIZE = 100
+
+
+def _read_config(path: Path) -> Dict[str, Any]:
+    """Parse a config file, reusing the parse while its contents are unchanged."""
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    config = _CONFIG_CACHE.get(digest)
+    if config is None:
+        config = yaml.load(data, Loader=_YAML_LOADER)
+        _CONFIG_CACHE[digest] = config
+        if len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+            _CONFIG_CACHE.popitem(last=False)
+    else:
+        _CONFIG_CACHE.move_to_end(digest)
+    return config
+
+
+class LLMCache:
+    """
+    In-process LRU cache for generated feedback.
+
+    Entries expire after `ttl` seconds and the least recently used entry is
+    evicted once `max_entries` is exceeded. Safe to share between threads.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Build a deterministic cache key from the request parameters."""
+        if orjson is not None:
+            payload = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)
+        else:
+            payload = json.dumps(parts, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def set(self, key: str, value: str) -> None:
+        """Store value under key, evicting the oldest entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def hit_ratio(self) -> float:
+        """Return the fraction of lookups served from the cache."""
+        with self._lock:
+            total = self.stats['hits'] + self.stats['misses']
+            return self.stats['hits'] / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a consistent copy of the hit/miss counters."""
+        with self._lock:
+            stats = dict(self.stats)
+        total = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / total, 3) if total else 0.0
+        return stats
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache over prompt embeddings.
+
+    A lookup returns the stored feedback of the most similar prompt when its
+    cosine similarity reaches `threshold`. Each entry records the generation
+    parameters it was produced with and only matches identical ones. Vectors are normalized on insert so
+    similarity is a plain dot product; the store is bounded and scanned
+    linearly, which is negligible next to a network round trip. Safe to share
+    between threads.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 256):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries: List[Tuple[List[float], str, Tuple]] = []
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> List[float]:
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def lookup(self, vector: List[float], params: Tuple) -> Optional[str]:
+        """Return feedback for the closest stored prompt above threshold."""
+        query = self._normalize(vector)
+        best_score, best_value = -1.0, None
+        with self._lock:
+            for stored, value, stored_params in self._entries:
+                if stored_params != params:
+                    continue
+                score = sum(a * b for a, b in zip(query, stored))
+                if score > best_score:
+                    best_score, best_value = score, value
+
+            if best_score >= self.threshold:
+                self.stats['hits'] += 1
+                return best_value
+
+            self.stats['misses'] += 1
+            return None
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return a consistent copy of the hit/miss counters."""
+        with self._lock:
+            return dict(self.stats)
+
+    def add(self, vector: List[float], value: str, params: Tuple) -> None:
+        """Store feedback for a prompt embedding, dropping the oldest if full."""
+        entry = (self._normalize(vector), value, params)
+        with self._lock:
+            self._entries.append(entry)
+            if len(self._entries) > self.max_entries:
+                self._entries.pop(0)
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter refilled at `rate` tokens per second.
+
+    reserve() always succeeds immediately and returns how long the caller must
+    wait before using its token, so no lock is held while callers sleep and
+    the same bucket can pace both threads and coroutines.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before it is valid."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
 
 
 class GeminiGeneratorService:
@@ -14,12 +228,41 @@ class GeminiGeneratorService:
     Implements rate limiting and retry logic.
     """
 
+    __slots__ = (
+        'config', 'logger', 'model',
+        '_api_keys', '_key_index', '_key_cooldown', '_key_lock',
+        '_cache', '_semantic_cache', '_structural',
+        '_bucket', '_max_concurrent', '_inflight', '_async_inflight', '_async_inflight_lock',
+        '_health_cache',
+        '_model_name', '_max_tokens', '_temperature', '_max_retries',
+        '_gen_config', '_gen_params'
+    )
+
     def __init__(self, config_path: Optional[str] = None):
         """Initialize the Gemini Generator Service."""
         self.config = self._load_config(config_path)
+        self._freeze_settings()
         self._setup_logging()
         self._setup_gemini_api()
-        self.last_request_time = 0
+        self._cache = self._setup_cache()
+        self._semantic_cache = self._setup_semantic_cache()
+        self._structural = self.config.get('cache', {}).get('structural', {}).get('enabled', False)
+        self._setup_rate_limiting()
+        self._health_cache: Tuple[float, Optional[Dict[str, Any]]] = (0.0, None)
+
+    def _freeze_settings(self):
+        """Copy per-request settings out of the nested config once."""
+        self._model_name = self.config['gemini']['model']
+        self._max_tokens = self.config['generation']['max_tokens']
+        self._temperature = self.config['generation']['temperature']
+        self._max_retries = self.config['rate_limiting']['max_retries']
+
+        # Settings a cached response depends on besides the prompt
+        self._gen_params: Tuple[str, int, float] = (self._model_name, self._max_tokens, self._temperature)
+        self._gen_config = genai.types.GenerationConfig(
+            max_output_tokens=self._max_tokens,
+            temperature=self._temperature
+        )
 
     def _load_config(self, config_path: Optional[str] = None) -> Dict[str, Any]:
         """Load configuration from YAML file."""
@@ -28,8 +271,8 @@ class GeminiGeneratorService:
         else:
             config_path = Path(config_path)
 
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+        # Copy so per-instance tweaks never leak into the shared parse
+        return copy.deepcopy(_read_config(config_path))
 
     def _setup_logging(self):
         """Setup logging configuration."""
@@ -39,49 +282,382 @@ class GeminiGeneratorService:
         # Create logs directory if it doesn't exist
         log_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # Configure logging
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
+        # Configure logging. Batch requests log from the event loop, which
+        # must not block on file writes; a listener thread does them.
+        if not logging.getLogger().handlers:
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            file_handler = logging.FileHandler(log_file)
+            stream_handler = logging.StreamHandler()
+            file_handler.setFormatter(formatter)
+            stream_handler.setFormatter(formatter)
+
+            log_queue = queue.Queue(-1)
+            listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+            listener.start()
+            atexit.register(listener.stop)
+
+            # basicConfig gets just the queue; the file and stream handlers
+            # keep the full formatter above
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            queue_handler.setFormatter(logging.Formatter('%(message)s'))
+            logging.basicConfig(level=log_level, handlers=[queue_handler])
         self.logger = logging.getLogger(self.config['service']['name'])
         self.logger.info(f"Initialized {self.config['service']['name']} v{self.config['service']['version']}")
 
     def _setup_gemini_api(self):
         """Setup Gemini API with credentials."""
-        # Load environment variables
-        load_dotenv()
-
-        # Get API key from environment
         api_key_env = self.config['gemini']['api_key_env']
-        api_key = os.getenv(api_key_env)
+        api_keys_env = self.config['gemini'].get('api_keys_env', 'GEMINI_API_KEYS')
+
+        # Load environment variables from .env only when they are not set yet
+        if not (os.getenv(api_keys_env) or os.getenv(api_key_env)):
+            from dotenv import load_dotenv
+            load_dotenv()
 
-        if not api_key:
+        # A comma-separated key list pools the quota of several keys;
+        # fall back to the single key variable
+        keys = [k.strip() for k in os.getenv(api_keys_env, '').split(',') if k.strip()]
+        if not keys and os.getenv(api_key_env):
+            keys = [os.getenv(api_key_env)]
+
+        if not keys:
             self.logger.error(f"API key not found in environment variable: {api_key_env}")
             raise ValueError(f"Missing environment variable: {api_key_env}")
 
-        # Configure Gemini API
-        genai.configure(api_key=api_key)
+        self._api_keys = keys
+        self._key_index = 0
+        self._key_cooldown = {}
+        self._key_lock = threading.Lock()
+        self._activate_key(0)
+        self.logger.info(f"Gemini API configured with model: {self.config['gemini']['model']}")
+
+    def _activate_key(self, index: int):
+        """Point the SDK and model at the API key at index."""
+        # Configure Gemini API. The SDK builds one client per configure call
+        # and every request on self.model reuses its pooled connection.
+        api_key = self._api_keys[index]
+        transport = self.config['gemini'].get('transport')
+        if transport:
+            genai.configure(api_key=api_key, transport=transport)
+        else:
+            genai.configure(api_key=api_key)
 
         # Initialize the model
-        self.model = genai.GenerativeModel(self.config['gemini']['model'])
-        self.logger.info(f"Gemini API configured with model: {self.config['gemini']['model']}")
+        self.model = genai.GenerativeModel(self._model_name)
+        self._key_index = index
 
-    def _apply_rate_limiting(self):
-        """Apply rate limiting between requests."""
-        delay = self.config['rate_limiting']['request_delay_seconds']
-        elapsed = time.time() - self.last_request_time
+    def _rotate_key(self, failed_index: int, cooldown: float) -> bool:
+        """
+        Cool down a quota-exhausted key and switch to the next available one.
+
+        Returns:
+            True if a usable key is active, False if every key is cooling down
+        """
+        with self._key_lock:
+            now = time.monotonic()
+            self._key_cooldown[failed_index] = now + cooldown
+
+            if self._key_index != failed_index:
+                # Another caller already moved on from this key
+                return True
+
+            for step in range(1, len(self._api_keys)):
+                index = (failed_index + step) % len(self._api_keys)
+                if self._key_cooldown.get(index, 0) <= now:
+                    self._activate_key(index)
+                    self.logger.info(f"Switched to API key #{index + 1} after quota error")
+                    return True
+
+            return False
+
+    def _setup_cache(self) -> Optional[LLMCache]:
+        """Create the response cache if enabled in config."""
+        cache_config = self.config.get('cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+
+        return LLMCache(
+            ttl=cache_config.get('ttl_seconds', 3600),
+            max_entries=cache_config.get('max_entries', 256)
+        )
 
-        if elapsed < delay:
-            wait_time = delay - elapsed
-            self.logger.info(f"Rate limiting: waiting {wait_time:.2f} seconds")
+    def _setup_semantic_cache(self) -> Optional[SemanticCache]:
+        """Create the embedding-similarity cache if enabled in config."""
+        semantic_config = self.config.get('cache', {}).get('semantic', {})
+        if not semantic_config.get('enabled', False):
+            return None
+
+        return SemanticCache(
+            threshold=semantic_config.get('similarity_threshold', 0.92),
+            max_entries=self.config['cache'].get('max_entries', 256)
+        )
+
+    def _embed_prompt(self, text: str) -> Optional[List[float]]:
+        """Embed text for the semantic cache; None if embedding fails."""
+        semantic_config = self.config['cache']['semantic']
+        try:
+            result = genai.embed_content(
+                model=semantic_config.get('embedding_model', 'models/text-embedding-004'),
+                content=text
+            )
+            return result['embedding']
+        except Exception as e:
+            self.logger.warning(f"Prompt embedding failed, skipping semantic cache: {e}")
+            return None
+
+    def _setup_rate_limiting(self):
+        """Create the request token bucket and in-flight limits."""
+        rate_config = self.config['rate_limiting']
+        rpm = rate_config.get('requests_per_minute')
+        if rpm is None:
+            delay = rate_config['request_delay_seconds']
+            if delay <= 0:
+                self.logger.error(f"Invalid request_delay_seconds: {delay}")
+                raise ValueError(f"rate_limiting.request_delay_seconds must be > 0, got {delay}")
+            rpm = 60 / delay
+
+        if rpm <= 0:
+            self.logger.error(f"Invalid requests_per_minute: {rpm}")
+            raise ValueError(f"rate_limiting.requests_per_minute must be > 0, got {rpm}")
+
+        self._bucket = TokenBucket(rate=rpm / 60, capacity=rate_config.get('burst', 1))
+        self._max_concurrent = rate_config.get('max_concurrent', 4)
+        self._inflight = threading.BoundedSemaphore(self._max_concurrent)
+        # asyncio semaphores are bound to one loop, so keep one per loop
+        self._async_inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_inflight_lock = threading.Lock()
+
+    def _async_inflight_semaphore(self) -> asyncio.Semaphore:
+        """Return the in-flight semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._async_inflight_lock:
+            semaphore = self._async_inflight.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self._max_concurrent)
+                self._async_inflight[loop] = semaphore
+            return semaphore
+
+    def _apply_rate_limiting(self):
+        """Wait until the token bucket allows another request."""
+        wait_time = self._bucket.reserve()
+        if wait_time > 0:
+            self.logger.info("Rate limiting: waiting %.2f seconds", wait_time)
             time.sleep(wait_time)
 
-        self.last_request_time = time.time()
+    async def _aapply_rate_limiting(self):
+        """Async variant of _apply_rate_limiting."""
+        wait_time = self._bucket.reserve()
+        if wait_time > 0:
+            self.logger.info("Rate limiting: waiting %.2f seconds", wait_time)
+            await asyncio.sleep(wait_time)
+
+    @staticmethod
+    def _result(feedback: Optional[str], error: Optional[str] = None,
+                tokens_used: int = 0) -> Dict[str, Any]:
+        """Build the output dict; status follows from whether feedback is set."""
+        return {
+            "feedback": feedback,
+            "status": "Success" if feedback is not None else "Failed",
+            "error": error,
+            "tokens_used": tokens_used
+        }
+
+    def _cache_key(self, prompt: str, style: str) -> Optional[str]:
+        """Exact-match cache key, or None when the response is not cacheable."""
+        # Only deterministic generations are safe to serve from cache
+        if self._cache is None or self._temperature != 0:
+            return None
+
+        return LLMCache.make_key(
+            model=self._model_name,
+            style=style,
+            prompt=prompt,
+            max_tokens=self._max_tokens,
+            temperature=self._temperature
+        )
+
+    def _lookup_exact(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return a result from the exact-match cache, if any."""
+        if cache_key is None:
+            return None
+
+        cached = self._cache.get(cache_key)
+        if cached is None:
+            return None
+
+        self.logger.info("Returning cached feedback")
+        return self._result(cached)
+
+    def _structural_key(self, prompt: str, style: str) -> Optional[Tuple[str, List[str]]]:
+        """Cache key for the prompt's template plus its slot values, if cacheable."""
+        if not self._structural or self._cache_key(prompt, style) is None:
+            return None
+
+        template, slots = _templatize(prompt)
+        if not slots:
+            # Nothing to re-specialize; the exact cache covers this prompt
+            return None
+
+        key = LLMCache.make_key(
+            kind="structural",
+            template=template,
+            style=style,
+            model=self._model_name,
+            max_tokens=self._max_tokens
+        )
+        return key, slots
+
+    def _lookup_structural(self, structural: Optional[Tuple[str, List[str]]]) -> Optional[Dict[str, Any]]:
+        """Return cached feedback re-specialized with this prompt's slot values."""
+        if structural is None:
+            return None
+
+        key, slots = structural
+        response_template = self._cache.get(key)
+        if response_template is None:
+            return None
+
+        self.logger.info("Returning structurally cached feedback")
+        return self._result(response_template.format(*slots))
+
+    def _store_structural(self, structural: Optional[Tuple[str, List[str]]], feedback_text: str) -> None:
+        """Cache feedback with this prompt's slot values turned back into fields."""
+        if structural is None:
+            return
+
+        key, slots = structural
+        response_template = feedback_text.replace('{', '{{').replace('}', '}}')
+        # Longest values first so "85.5" is not split by a "85" slot
+        for index in sorted(range(len(slots)), key=lambda i: -len(slots[i])):
+            response_template = re.sub(
+                rf"(?<![\d.{{]){re.escape(slots[index])}(?![\d}}]|\.\d)",
+                f"{{{index}}}",
+                response_template
+            )
+        self._cache.set(key, response_template)
+
+    def _lookup_semantic(self, embedding: Optional[List[float]]) -> Optional[Dict[str, Any]]:
+        """Return a result from the semantic cache, if any."""
+        if embedding is None:
+            return None
+
+        cached = self._semantic_cache.lookup(embedding, self._gen_params)
+        if cached is None:
+            return None
+
+        self.logger.info("Returning semantically cached feedback")
+        return self._result(cached)
+
+    def _store_cache(self, cache_key: Optional[str],
+                     embedding: Optional[List[float]], feedback_text: str) -> None:
+        """Record a generated response in the enabled caches."""
+        if cache_key is not None:
+            self._cache.set(cache_key, feedback_text)
+        if embedding is not None:
+            self._semantic_cache.add(embedding, feedback_text, self._gen_params)
+
+    @staticmethod
+    def _count_tokens(response, full_prompt: str, feedback_text: str) -> int:
+        """Token usage reported by the API, or a word-count approximation."""
+        usage = getattr(response, 'usage_metadata', None)
+        total = getattr(usage, 'total_token_count', None)
+        if isinstance(total, int) and total > 0:
+            return total
+        return len(full_prompt.split()) + len(feedback_text.split())
+
+    def _on_success(self, full_prompt: str, response, cache_key: Optional[str],
+                    embedding: Optional[List[float]],
+                    structural: Optional[Tuple[str, List[str]]] = None) -> Dict[str, Any]:
+        """Account tokens, populate caches and build the success result."""
+        feedback_text = response.text
+        tokens_used = self._count_tokens(response, full_prompt, feedback_text)
+
+        self.logger.info("Successfully generated feedback (%d tokens)", tokens_used)
+        self._store_cache(cache_key, embedding, feedback_text)
+        self._store_structural(structural, feedback_text)
+
+        return self._result(feedback_text, tokens_used=tokens_used)
+
+    def _on_failure(self, attempt: int, max_retries: int, error: Exception) -> Optional[Dict[str, Any]]:
+        """
+        Handle a failed attempt.
+
+        Returns:
+            A final failure result, or None if the caller should retry
+        """
+        error_msg = str(error)
+        self.logger.warning(f"Attempt {attempt + 1} failed: {error_msg}")
+
+        # Check for specific error types
+        if self._is_auth_error(error):
+            self.logger.error("Invalid API key detected")
+            return self._result(None, "Invalid API key")
+
+        if not isinstance(error, _RETRYABLE_ERRORS):
+            # Retrying will not fix a bad request or a bug on our side
+            self.logger.error(f"Non-retryable error: {error_msg}")
+            return self._result(None, error_msg)
+
+        if attempt >= max_retries - 1:
+            # Last attempt failed
+            self.logger.error(f"All retry attempts failed: {error_msg}")
+            return self._result(None, error_msg)
+
+        return None
+
+    @staticmethod
+    def _is_auth_error(error: Exception) -> bool:
+        """Return True when the API rejected our credentials."""
+        if isinstance(error, (google_exceptions.Unauthenticated, google_exceptions.PermissionDenied)):
+            return True
+
+        # Gemini reports an unknown key as 400 INVALID_ARGUMENT / API_KEY_INVALID
+        return isinstance(error, google_exceptions.InvalidArgument) and (
+            getattr(error, 'reason', None) == 'API_KEY_INVALID' or "API key" in str(error)
+        )
+
+    @staticmethod
+    def _is_quota_error(error: Exception) -> bool:
+        """Return True for 429 / RESOURCE_EXHAUSTED responses."""
+        return isinstance(error, google_exceptions.ResourceExhausted)
+
+    @staticmethod
+    def _server_retry_delay(error: Exception) -> Optional[float]:
+        """
+        Return the retry delay requested by a 429 response, if any.
+
+        Quota errors carry a google.rpc.RetryInfo in their details; older
+        responses only mention the delay in the message text.
+        """
+        if not GeminiGeneratorService._is_quota_error(error):
+            return None
+
+        for detail in getattr(error, 'details', None) or []:
+            delay = getattr(detail, 'retry_delay', None)
+            if delay is not None and hasattr(delay, 'seconds'):
+                return delay.seconds + delay.nanos / 1e9
+
+        match = re.search(r"retry(?:_delay)?\s*(?:in|\{\s*seconds:)\s*([\d.]+)", str(error), re.IGNORECASE)
+        if match:
+            return float(match.group(1))
+        return None
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """
+        Delay before the next attempt.
+
+        Uses the server's hint when given, otherwise exponential backoff with
+        full jitter so concurrent clients do not retry in lockstep.
+        """
+        server_delay = self._server_retry_delay(error)
+        if server_delay is not None:
+            return server_delay
+
+        rate_config = self.config['rate_limiting']
+        backoff = rate_config['retry_delay_seconds'] * (2 ** attempt)
+        return random.uniform(0, min(rate_config.get('max_retry_delay_seconds', 60), backoff))
 
     def _generate_feedback_with_retry(self, prompt: str, style: str) -> Dict[str, Any]:
         """
@@ -90,78 +666,119 @@ class GeminiGeneratorService:
         Returns:
             Dict with feedback, status, error, and tokens_used
         """
-        max_retries = self.config['rate_limiting']['max_retries']
-        retry_delay = self.config['rate_limiting']['retry_delay_seconds']
+        max_retries = self._max_retries
+
+        # Prepare the full prompt with style
+        full_prompt = f"Style: {style}\n\n{prompt}"
+
+        cache_key = self._cache_key(prompt, style)
+        cached = self._lookup_exact(cache_key)
+        if cached is not None:
+            return cached
+
+        structural = self._structural_key(prompt, style)
+        cached = self._lookup_structural(structural)
+        if cached is not None:
+            return cached
+
+        # Embed only after an exact miss; embedding is itself an API call
+        embedding = self._embed_prompt(full_prompt) if self._semantic_cache else None
+        cached = self._lookup_semantic(embedding)
+        if cached is not None:
+            return cached
 
         for attempt in range(max_retries):
             try:
                 # Apply rate limiting
                 self._apply_rate_limiting()
 
-                # Prepare the full prompt with style
-                full_prompt = f"Style: {style}\n\n{prompt}"
-
                 # Generate content
-                self.logger.info(f"Generating feedback (attempt {attempt + 1}/{max_retries})")
+                self.logger.info("Generating feedback (attempt %d/%d)", attempt + 1, max_retries)
 
-                response = self.model.generate_content(
-                    full_prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        max_output_tokens=self.config['generation']['max_tokens'],
-                        temperature=self.config['generation']['temperature']
+                key_index = self._key_index
+                with self._inflight:
+                    response = self.model.generate_content(
+                        full_prompt,
+                        generation_config=self._gen_config
                     )
-                )
 
-                # Extract feedback text
-                feedback_text = response.text
+                return self._on_success(full_prompt, response, cache_key, embedding, structural)
+
+            except Exception as e:
+                failure = self._on_failure(attempt, max_retries, e)
+                if failure is not None:
+                    return failure
+
+                # Not the last attempt, wait before retrying
+                retry_delay = self._retry_delay(e, attempt)
+                if self._is_quota_error(e) and self._rotate_key(key_index, retry_delay):
+                    continue
+                self.logger.info("Retrying in %.2f seconds...", retry_delay)
+                time.sleep(retry_delay)
+
+        # Should never reach here, but just in case
+        return self._result(None, "Max retries exceeded")
+
+    async def _agenerate_feedback_with_retry(self, prompt: str, style: str) -> Dict[str, Any]:
+        """Async variant of _generate_feedback_with_retry."""
+        max_retries = self._max_retries
+
+        full_prompt = f"Style: {style}\n\n{prompt}"
+
+        cache_key = self._cache_key(prompt, style)
+        cached = self._lookup_exact(cache_key)
+        if cached is not None:
+            return cached
+
+        structural = self._structural_key(prompt, style)
+        cached = self._lookup_structural(structural)
+        if cached is not None:
+            return cached
 
-                # Calculate tokens used (approximation)
-                tokens_used = len(full_prompt.split()) + len(feedback_text.split())
+        embedding = None
+        if self._semantic_cache is not None:
+            embedding = await asyncio.to_thread(self._embed_prompt, full_prompt)
+        cached = self._lookup_semantic(embedding)
+        if cached is not None:
+            return cached
 
-                self.logger.info(f"Successfully generated feedback ({tokens_used} tokens)")
+        for attempt in range(max_retries):
+            try:
+                await self._aapply_rate_limiting()
+
+                self.logger.info("Generating feedback (attempt %d/%d)", attempt + 1, max_retries)
+
+                key_index = self._key_index
+                async with self._async_inflight_semaphore():
+                    response = await self.model.generate_content_async(
+                        full_prompt,
+                        generation_config=self._gen_config
+                    )
 
-                return {
-                    "feedback": feedback_text,
-                    "status": "Success",
-                    "error": None,
-                    "tokens_used": tokens_used
-                }
+                return self._on_success(full_prompt, response, cache_key, embedding, structural)
 
             except Exception as e:
-                error_msg = str(e)
-                self.logger.warning(f"Attempt {attempt + 1} failed: {error_msg}")
-
-                # Check for specific error types
-                if "API_KEY" in error_msg.upper() or "INVALID" in error_msg.upper():
-                    self.logger.error("Invalid API key detected")
-                    return {
-                        "feedback": None,
-                        "status": "Failed",
-                        "error": "Invalid API key",
-                        "tokens_used": 0
-                    }
-
-                # If not the last attempt, wait before retrying
-                if attempt < max_retries - 1:
-                    self.logger.info(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                else:
-                    # Last attempt failed
-                    self.logger.error(f"All retry attempts failed: {error_msg}")
-                    return {
-                        "feedback": None,
-                        "status": "Failed",
-                        "error": error_msg,
-                        "tokens_used": 0
-                    }
+                failure = self._on_failure(attempt, max_retries, e)
+                if failure is not None:
+                    return failure
 
-        # Should never reach here, but just in case
-        return {
-            "feedback": None,
-            "status": "Failed",
-            "error": "Max retries exceeded",
-            "tokens_used": 0
-        }
+                retry_delay = self._retry_delay(e, attempt)
+                if self._is_quota_error(e) and self._rotate_key(key_index, retry_delay):
+                    continue
+                self.logger.info("Retrying in %.2f seconds...", retry_delay)
+                await asyncio.sleep(retry_delay)
+
+        return self._result(None, "Max retries exceeded")
+
+    def _validate_input(self, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a failure result if required fields are missing."""
+        if "prompt" not in input_data or "style" not in input_data:
+            self.logger.error("Missing required fields in input")
+            return self._result(None, "Missing required fields: prompt and/or style")
+
+        context = input_data.get("context", {})
+        self.logger.info("Processing request for email_id: %s", context.get('email_id', 'N/A'))
+        return None
 
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -187,48 +804,172 @@ class GeminiGeneratorService:
         """
         try:
             # Validate input
-            if "prompt" not in input_data or "style" not in input_data:
-                self.logger.error("Missing required fields in input")
-                return {
-                    "feedback": None,
-                    "status": "Failed",
-                    "error": "Missing required fields: prompt and/or style",
-                    "tokens_used": 0
-                }
+            invalid = self._validate_input(input_data)
+            if invalid is not None:
+                return invalid
 
-            prompt = input_data["prompt"]
-            style = input_data["style"]
-            context = input_data.get("context", {})
+            # Generate feedback with retry logic
+            return self._generate_feedback_with_retry(input_data["prompt"], input_data["style"])
 
-            self.logger.info(f"Processing request for email_id: {context.get('email_id', 'N/A')}")
+        except Exception as e:
+            self.logger.error(f"Unexpected error in process: {str(e)}")
+            return self._result(None, f"Unexpected error: {str(e)}")
 
-            # Generate feedback with retry logic
-            result = self._generate_feedback_with_retry(prompt, style)
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of process for concurrent callers.
+
+        Uses the same input/output format as process. Many requests can be
+        awaited together with asyncio.gather; rate limiting still spaces the
+        underlying API calls.
+        """
+        try:
+            invalid = self._validate_input(input_data)
+            if invalid is not None:
+                return invalid
 
-            return result
+            return await self._agenerate_feedback_with_retry(input_data["prompt"], input_data["style"])
 
         except Exception as e:
-            self.logger.error(f"Unexpected error in process: {str(e)}")
-            return {
-                "feedback": None,
-                "status": "Failed",
-                "error": f"Unexpected error: {str(e)}",
-                "tokens_used": 0
-            }
+            self.logger.error(f"Unexpected error in aprocess: {str(e)}")
+            return self._result(None, f"Unexpected error: {str(e)}")
+
+    def _generate_batch(self, items: List[Dict[str, Any]]) -> Optional[List[Tuple[str, int]]]:
+        """
+        Generate feedback for several inputs in a single JSON-mode request.
+
+        Returns:
+            (feedback, tokens_used) per item in order, or None if the call
+            failed or the reply did not match the request
+        """
+        payload = [
+            {"id": i, "style": item["style"], "prompt": item["prompt"]}
+            for i, item in enumerate(items)
+        ]
+        batch_prompt = (
+            "Write feedback for each item below, following its style. Return a JSON "
+            "array with one object per item: {\"id\": <item id>, \"feedback\": <text>}.\n\n"
+            + json.dumps(payload, ensure_ascii=False)
+        )
+        generation_config = genai.types.GenerationConfig(
+            max_output_tokens=self._max_tokens * len(items),
+            temperature=self._temperature,
+            response_mime_type="application/json"
+        )
+
+        try:
+            self._apply_rate_limiting()
+            self.logger.info("Generating feedback for batch of %d", len(items))
+            with self._inflight:
+                response = self.model.generate_content(batch_prompt, generation_config=generation_config)
+
+            by_id = {entry["id"]: entry["feedback"] for entry in json.loads(response.text)}
+            feedbacks = [by_id[i] for i in range(len(items))]
+        except Exception as e:
+            self.logger.warning(f"Batch generation failed, falling back to single requests: {e}")
+            return None
+
+        if not all(isinstance(text, str) and text for text in feedbacks):
+            self.logger.warning("Batch reply missing feedback, falling back to single requests")
+            return None
+
+        tokens_used = self._count_tokens(response, batch_prompt, " ".join(feedbacks))
+        return [(text, tokens_used // len(items)) for text in feedbacks]
+
+    def process_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Generate feedback for many inputs with one API call per batch.
+
+        Inputs and results use the same format as process, in the same
+        order. Batches hold up to generation.batch_size inputs; a batch whose
+        reply cannot be parsed is retried one input at a time via process.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(inputs)
+        pending = []
+
+        for i, input_data in enumerate(inputs):
+            invalid = self._validate_input(input_data)
+            if invalid is not None:
+                results[i] = invalid
+                continue
+
+            prompt, style = input_data["prompt"], input_data["style"]
+            cached = self._lookup_exact(self._cache_key(prompt, style))
+            if cached is None:
+                cached = self._lookup_structural(self._structural_key(prompt, style))
+            if cached is not None:
+                results[i] = cached
+                continue
+
+            pending.append(i)
+
+        batch_size = self.config['generation'].get('batch_size', 8)
+        for start in range(0, len(pending), batch_size):
+            indices = pending[start:start + batch_size]
+            generated = self._generate_batch([inputs[i] for i in indices])
+
+            if generated is None:
+                for i in indices:
+                    results[i] = self.process(inputs[i])
+                continue
+
+            for i, (feedback_text, tokens_used) in zip(indices, generated):
+                prompt, style = inputs[i]["prompt"], inputs[i]["style"]
+                self._store_cache(self._cache_key(prompt, style), None, feedback_text)
+                self._store_structural(self._structural_key(prompt, style), feedback_text)
+                results[i] = self._result(feedback_text, tokens_used=tokens_used)
+
+        return results
+
+    def _ping(self) -> Dict[str, Any]:
+        """Verify the API accepts our key with a free count_tokens call."""
+        api_configured = len(self._api_keys) > 0
+        health = {
+            "service": self.config['service']['name'],
+            "version": self.config['service']['version'],
+            "status": "unhealthy",
+            "api_configured": api_configured,
+            "api_reachable": False
+        }
+        if not api_configured:
+            return health
+
+        try:
+            # Bounded so an unreachable API can't stall health checks
+            # through the client's default retries
+            timeout = self.config.get('health', {}).get('timeout_seconds', 10)
+            self.model.count_tokens("ping", request_options={'timeout': timeout})
+            health["api_reachable"] = True
+            health["status"] = "healthy"
+        except Exception as e:
+            self.logger.warning(f"Health check ping failed: {e}")
+            health["error"] = str(e)
+
+        return health
 
     def health_check(self) -> Dict[str, Any]:
-        """Check service health."""
+        """
+        Check service health.
+
+        The API ping result is reused for health.cache_seconds so frequent
+        liveness probes do not each make a request.
+        """
         try:
-            # Simple health check - verify API key is configured
-            api_key = os.getenv(self.config['gemini']['api_key_env'])
-            api_configured = api_key is not None and len(api_key) > 0
+            cache_seconds = self.config.get('health', {}).get('cache_seconds', 30)
+            checked_at, cached = self._health_cache
+            if cached is None or time.monotonic() - checked_at >= cache_seconds:
+                cached = self._ping()
+                self._health_cache = (time.monotonic(), cached)
 
-            return {
-                "service": self.config['service']['name'],
-                "version": self.config['service']['version'],
-                "status": "healthy" if api_configured else "unhealthy",
-                "api_configured": api_configured
-            }
+            health = dict(cached)
+
+            if self._cache is not None:
+                health["cache"] = self._cache.snapshot()
+
+            if self._semantic_cache is not None:
+                health["semantic_cache"] = self._semantic_cache.snapshot()
+
+            return health
         except Exception as e:
             return {
                 "service": self.config['service']['name'],
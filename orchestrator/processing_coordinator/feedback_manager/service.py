@@ -7,14 +7,26 @@ Excel I/O is handled by parent coordinator.
 """
 
 import argparse
+import asyncio
+import atexit
+import copy
 import importlib.util
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Type
+from types import ModuleType
+from typing import ClassVar, Dict, Any, List, Optional, Tuple, Type
 
-import yaml
+# Child service and log paths are relative to this directory
+_BASE_PATH = Path(__file__).parent.resolve()
+
+# Config parsing is shared with the other services (shared/utils)
+sys.path.insert(0, str(_BASE_PATH.parents[2] / 'shared' / 'utils'))
+from config_cache import read_yaml  # noqa: E402
 
 
 class FeedbackManager:
@@ -23,6 +35,9 @@ class FeedbackManager:
     Coordinates style_selector and gemini_generator services.
     """
 
+    # Child service modules by absolute path, shared by all instances
+    _MODULE_CACHE: ClassVar[Dict[Path, ModuleType]] = {}
+
     def __init__(self, config_path: str = "config.yaml"):
         """
         Initialize the Feedback Manager service.
@@ -31,20 +46,21 @@ class FeedbackManager:
             config_path: Path to configuration file
         """
         self.config = self._load_config(config_path)
+        # Successful Gemini results keyed by the exact request (see _reply_key)
+        self._reply_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._reply_cache_stats = {'hits': 0, 'misses': 0}
         self._setup_logging()
         self._initialize_child_services()
 
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
         try:
-            config_file = Path(config_path)
-            if not config_file.exists():
-                raise FileNotFoundError(f"Config file not found: {config_path}")
-
-            with open(config_file, 'r') as f:
-                return yaml.safe_load(f)
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML in config file: {e}")
+            # abspath, unlike resolve(), needs no filesystem calls
+            config_file = Path(os.path.abspath(config_path))
+            # Copy so callers can't mutate the shared parse
+            return copy.deepcopy(read_yaml(config_file, 'FEEDBACK_MGR_NO_CACHE'))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Config file not found: {config_path}")
 
     def _setup_logging(self):
         """Configure logging based on config settings using module-specific logger."""
@@ -54,9 +70,8 @@ class FeedbackManager:
         log_format = log_config.get('format',
             '%(asctime)s | %(levelname)s | %(name)s | %(message)s')
 
-        # Resolve log file path relative to this file's directory
-        base_path = Path(__file__).parent.resolve()
-        log_file = (base_path / log_file_config).resolve()
+        # Log file path is relative to this file's directory
+        log_file = _BASE_PATH / log_file_config
 
         # Create logs directory if it doesn't exist
         log_file.parent.mkdir(parents=True, exist_ok=True)
@@ -67,6 +82,7 @@ class FeedbackManager:
         self.logger.setLevel(log_level)
 
         # Avoid adding duplicate handlers if logger already configured
+        self._log_listener = None
         if not self.logger.handlers:
             formatter = logging.Formatter(log_format)
 
@@ -74,14 +90,29 @@ class FeedbackManager:
             file_handler = logging.FileHandler(log_file)
             file_handler.setLevel(log_level)
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+            handlers = [file_handler]
 
             # Console handler (optional)
             if log_config.get('console', True):
                 console_handler = logging.StreamHandler(sys.stdout)
                 console_handler.setLevel(log_level)
                 console_handler.setFormatter(formatter)
-                self.logger.addHandler(console_handler)
+                handlers.append(console_handler)
+
+            # process() logs per record from the event loop; writing the
+            # log file there would stall every in-flight Gemini call
+            log_queue = queue.Queue(-1)
+            self._log_listener = logging.handlers.QueueListener(
+                log_queue, *handlers, respect_handler_level=True
+            )
+            self._log_listener.start()
+            atexit.register(self._log_listener.stop)
+
+            # Bare message only: log_format is applied once, when the
+            # listener's file and console handlers write the record
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            queue_handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger.addHandler(queue_handler)
 
         self.logger.info(
             f"Feedback Manager v{self.config['manager']['version']} initialized"
@@ -91,6 +122,9 @@ class FeedbackManager:
         """
         Dynamically load a module from a file path using importlib.
 
+        Each file is executed once per process; later calls return the
+        cached module.
+
         Args:
             module_name: Name to assign to the loaded module
             module_path: Path to the module's .py file
@@ -101,26 +135,30 @@ class FeedbackManager:
         Raises:
             ImportError: If module cannot be loaded
         """
-        if not module_path.exists():
+        resolved = Path(os.path.abspath(module_path))
+        cached = self._MODULE_CACHE.get(resolved)
+        if cached is not None:
+            return cached
+
+        if not resolved.exists():
             raise ImportError(f"Module file not found: {module_path}")
 
-        spec = importlib.util.spec_from_file_location(module_name, module_path)
+        spec = importlib.util.spec_from_file_location(module_name, resolved)
         if spec is None or spec.loader is None:
             raise ImportError(f"Cannot create module spec for: {module_path}")
 
         module = importlib.util.module_from_spec(spec)
         sys.modules[module_name] = module
         spec.loader.exec_module(module)
+        self._MODULE_CACHE[resolved] = module
         return module
 
     def _initialize_child_services(self):
         """Initialize child services (style_selector and gemini_generator)."""
         try:
-            # Resolve paths relative to this file's directory
-            base_path = Path(__file__).parent.resolve()
-
-            style_selector_path = (base_path / self.config['children']['style_selector']).resolve()
-            gemini_generator_path = (base_path / self.config['children']['gemini_generator']).resolve()
+            # Paths are relative to this file's directory
+            style_selector_path = Path(os.path.abspath(_BASE_PATH / self.config['children']['style_selector']))
+            gemini_generator_path = Path(os.path.abspath(_BASE_PATH / self.config['children']['gemini_generator']))
 
             # Load child service modules dynamically
             style_module = self._load_module_from_path(
@@ -151,6 +189,98 @@ class FeedbackManager:
             self.logger.error(f"Failed to initialize child services: {e}")
             raise
 
+    def _build_gemini_input(self, grade_record: Dict[str, Any]) -> Dict[str, Any]:
+        """Select a style for the record's grade and build the Gemini request."""
+        email_id = grade_record.get('email_id')
+        grade = grade_record.get('grade')
+
+        self.logger.debug(f"Generating feedback for {email_id}, grade: {grade}")
+
+        # Step 1: Select style based on grade
+        style_result = self.style_selector.process({'grade': grade})
+        style_name = style_result['style_name']
+        prompt = style_result['prompt_template']
+
+        self.logger.debug(f"Selected style '{style_name}' for grade {grade}")
+
+        return {
+            'prompt': prompt,
+            'style': style_name,
+            'context': {
+                'grade': grade,
+                'email_id': email_id
+            }
+        }
+
+    def _reply_key(self, gemini_input: Dict[str, Any]) -> Optional[Tuple]:
+        """
+        Reply cache key for a Gemini request, or None when caching is off.
+
+        The key is the whole rendered request (style, prompt and context,
+        which carries the record's email_id and exact grade), so a cached
+        reply is only reused for an identical request, e.g. a duplicate row
+        or a retried batch, never for another student.
+        """
+        if not self.config.get('reply_cache', {}).get('enabled', False):
+            return None
+        try:
+            context = tuple(sorted(gemini_input['context'].items()))
+            key = (gemini_input['style'], gemini_input['prompt'], context)
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _cached_reply(self, key: Optional[Tuple]) -> Optional[Dict[str, Any]]:
+        """Return the cached Gemini result for key, counting the lookup."""
+        if key is None:
+            return None
+        feedback_result = self._reply_cache.get(key)
+        if feedback_result is None:
+            self._reply_cache_stats['misses'] += 1
+            return None
+        self._reply_cache.move_to_end(key)
+        self._reply_cache_stats['hits'] += 1
+        return feedback_result
+
+    def _remember_reply(self, key: Optional[Tuple],
+                        feedback_result: Dict[str, Any]) -> None:
+        """Cache a successful Gemini result, evicting the least recently used."""
+        if key is None or feedback_result['status'] != 'Success' or not feedback_result['feedback']:
+            return
+        self._reply_cache[key] = feedback_result
+        self._reply_cache.move_to_end(key)
+        max_entries = self.config.get('reply_cache', {}).get('max_entries', 1024)
+        while len(self._reply_cache) > max_entries:
+            self._reply_cache.popitem(last=False)
+
+    def _to_feedback_record(self, email_id: Optional[str],
+                            feedback_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a gemini_generator result into a feedback record."""
+        if feedback_result['status'] == 'Success' and feedback_result['feedback']:
+            self.logger.info(f"Successfully generated feedback for {email_id}")
+            return {
+                'email_id': email_id,
+                'reply': feedback_result['feedback'],
+                'status': 'Ready',
+                'error': None
+            }
+
+        # API failed
+        error_msg = feedback_result.get('error', 'Unknown error')
+        self.logger.warning(f"Failed to generate feedback for {email_id}: {error_msg}")
+        return self._failed_record(email_id, error_msg)
+
+    @staticmethod
+    def _failed_record(email_id: Optional[str], error: str) -> Dict[str, Any]:
+        """Feedback record for a grade record whose reply could not be generated."""
+        return {
+            'email_id': email_id,
+            'reply': None,
+            'status': 'Missing: reply',
+            'error': error
+        }
+
     def generate_feedback(self, grade_record: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate feedback for a single grade record.
@@ -162,58 +292,121 @@ class FeedbackManager:
             Dict with 'email_id', 'reply', 'status', 'error' (if any)
         """
         email_id = grade_record.get('email_id')
-        grade = grade_record.get('grade')
+        if grade_record.get('grade') is None:
+            return self._failed_record(email_id, 'grade missing')
 
         try:
-            self.logger.debug(f"Generating feedback for {email_id}, grade: {grade}")
-
-            # Step 1: Select style based on grade
-            style_result = self.style_selector.process({'grade': grade})
-            style_name = style_result['style_name']
-            prompt = style_result['prompt_template']
-
-            self.logger.debug(f"Selected style '{style_name}' for grade {grade}")
-
-            # Step 2: Generate feedback using Gemini
-            gemini_input = {
-                'prompt': prompt,
-                'style': style_name,
-                'context': {
-                    'grade': grade,
-                    'email_id': email_id
-                }
-            }
+            gemini_input = self._build_gemini_input(grade_record)
 
-            feedback_result = self.gemini_generator.process(gemini_input)
+            # Step 2: Generate feedback using Gemini, unless this exact
+            # request already has a reply
+            key = self._reply_key(gemini_input)
+            feedback_result = self._cached_reply(key)
+            if feedback_result is None:
+                feedback_result = self.gemini_generator.process(gemini_input)
+                self._remember_reply(key, feedback_result)
 
             # Step 3: Return result
-            if feedback_result['status'] == 'Success' and feedback_result['feedback']:
-                self.logger.info(f"Successfully generated feedback for {email_id}")
-                return {
-                    'email_id': email_id,
-                    'reply': feedback_result['feedback'],
-                    'status': 'Ready',
-                    'error': None
-                }
-            else:
-                # API failed
-                error_msg = feedback_result.get('error', 'Unknown error')
-                self.logger.warning(f"Failed to generate feedback for {email_id}: {error_msg}")
-                return {
-                    'email_id': email_id,
-                    'reply': None,
-                    'status': 'Missing: reply',
-                    'error': error_msg
-                }
+            return self._to_feedback_record(email_id, feedback_result)
 
         except Exception as e:
             self.logger.error(f"Error processing record {email_id}: {e}")
-            return {
-                'email_id': email_id,
-                'reply': None,
-                'status': 'Missing: reply',
-                'error': str(e)
-            }
+            return self._failed_record(email_id, str(e))
+
+    async def _acall_gemini(self, gemini_input: Dict[str, Any],
+                            semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Await one Gemini request bounded by semaphore."""
+        async with semaphore:
+            return await self.gemini_generator.aprocess(gemini_input)
+
+    async def _agenerate_feedback(self, grade_record: Dict[str, Any],
+                                  semaphore: asyncio.Semaphore,
+                                  in_flight: Optional[Dict[Tuple, asyncio.Task]] = None
+                                  ) -> Dict[str, Any]:
+        """
+        Async variant of generate_feedback bounded by semaphore.
+
+        Records sharing a reply cache key await the same in_flight request.
+        """
+        email_id = grade_record.get('email_id')
+        self.logger.info(f"Processing record: {email_id}")
+
+        try:
+            gemini_input = self._build_gemini_input(grade_record)
+
+            key = self._reply_key(gemini_input)
+            feedback_result = self._cached_reply(key)
+            if feedback_result is None:
+                task = in_flight.get(key) if in_flight is not None and key is not None else None
+                if task is None:
+                    task = asyncio.ensure_future(self._acall_gemini(gemini_input, semaphore))
+                    if in_flight is not None and key is not None:
+                        in_flight[key] = task
+                else:
+                    # Counted as a miss above, but served without a request
+                    self._reply_cache_stats['misses'] -= 1
+                    self._reply_cache_stats['hits'] += 1
+                feedback_result = await task
+                self._remember_reply(key, feedback_result)
+
+            return self._to_feedback_record(email_id, feedback_result)
+
+        except Exception as e:
+            self.logger.error(f"Error processing record {email_id}: {e}")
+            return self._failed_record(email_id, str(e))
+
+    async def _agenerate_all(self, grade_records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Generate feedback for all records concurrently, preserving order."""
+        max_concurrency = self.config.get('rate_limiting', {}).get('max_concurrency', 4)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        in_flight: Dict[Tuple, asyncio.Task] = {}
+        return await asyncio.gather(
+            *(self._agenerate_feedback(record, semaphore, in_flight) for record in grade_records)
+        )
+
+    def _generate_feedback_batch(self, grade_records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Generate feedback for a chunk of records with one batched Gemini request."""
+        feedback_records: List[Optional[Dict[str, Any]]] = [None] * len(grade_records)
+        pending = []  # (record index, gemini input index)
+        gemini_inputs = []
+        keys = []
+        input_for_key: Dict[Tuple, int] = {}
+
+        for idx, record in enumerate(grade_records):
+            email_id = record.get('email_id')
+            try:
+                gemini_input = self._build_gemini_input(record)
+            except Exception as e:
+                self.logger.error(f"Error processing record {email_id}: {e}")
+                feedback_records[idx] = self._failed_record(email_id, str(e))
+                continue
+
+            key = self._reply_key(gemini_input)
+            feedback_result = self._cached_reply(key)
+            if feedback_result is not None:
+                feedback_records[idx] = self._to_feedback_record(email_id, feedback_result)
+            elif key is not None and key in input_for_key:
+                # Identical request earlier in this chunk; share its reply
+                self._reply_cache_stats['misses'] -= 1
+                self._reply_cache_stats['hits'] += 1
+                pending.append((idx, input_for_key[key]))
+            else:
+                if key is not None:
+                    input_for_key[key] = len(gemini_inputs)
+                pending.append((idx, len(gemini_inputs)))
+                gemini_inputs.append(gemini_input)
+                keys.append(key)
+
+        if gemini_inputs:
+            results = self.gemini_generator.process_batch(gemini_inputs)
+            for key, feedback_result in zip(keys, results):
+                self._remember_reply(key, feedback_result)
+            for idx, input_idx in pending:
+                feedback_records[idx] = self._to_feedback_record(
+                    grade_records[idx].get('email_id'), results[input_idx]
+                )
+
+        return feedback_records
 
     def process(self, grade_records: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -236,26 +429,32 @@ class FeedbackManager:
                 'failed_count': 0
             }
 
-        feedback_records = []
-        generated_count = 0
-        failed_count = 0
-        rate_limit_delay = self.config.get('rate_limiting', {}).get('delay_between_calls_seconds', 0)
-
-        for idx, record in enumerate(grade_records, 1):
-            self.logger.info(f"Processing record {idx}/{len(grade_records)}: {record.get('email_id')}")
-
-            feedback_record = self.generate_feedback(record)
-            feedback_records.append(feedback_record)
-
-            if feedback_record['status'] == 'Ready':
-                generated_count += 1
+        # Records without a grade fail without touching the child services
+        feedback_records: List[Optional[Dict[str, Any]]] = [None] * len(grade_records)
+        pending = []
+        for idx, record in enumerate(grade_records):
+            if record.get('grade') is None:
+                feedback_records[idx] = self._failed_record(record.get('email_id'), 'grade missing')
             else:
-                failed_count += 1
-
-            # Apply rate limiting between calls (except for last record)
-            if idx < len(grade_records) and rate_limit_delay > 0:
-                self.logger.debug(f"Rate limiting: waiting {rate_limit_delay}s")
-                time.sleep(rate_limit_delay)
+                pending.append(idx)
+        active_records = [grade_records[idx] for idx in pending]
+
+        batching = self.config.get('batching', {})
+        if batching.get('enabled', False):
+            # Several records per Gemini request
+            size = batching.get('size', 8)
+            results = []
+            for start in range(0, len(active_records), size):
+                results.extend(self._generate_feedback_batch(active_records[start:start + size]))
+        else:
+            # Requests run concurrently; gemini_generator's token bucket keeps
+            # them within the API rate limit
+            results = asyncio.run(self._agenerate_all(active_records))
+
+        for idx, feedback_record in zip(pending, results):
+            feedback_records[idx] = feedback_record
+        generated_count = sum(1 for r in feedback_records if r['status'] == 'Ready')
+        failed_count = len(feedback_records) - generated_count
 
         result = {
             'feedback': feedback_records,
@@ -300,6 +499,12 @@ class FeedbackManager:
         except Exception as e:
             health['gemini_generator'] = f'Error: {e}'
 
+        if self.config.get('reply_cache', {}).get('enabled', False):
+            stats = self._reply_cache_stats
+            health['reply_cache'] = (
+                f"{len(self._reply_cache)} entries, {stats['hits']} hits, {stats['misses']} misses"
+            )
+
         return health
 
 
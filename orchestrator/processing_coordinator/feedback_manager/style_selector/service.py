@@ -6,14 +6,52 @@ Selects feedback style and prompt template based on student's grade.
 Returns the appropriate persona and prompt for the Gemini Generator.
 """
 
-import argparse
+import atexit
+import bisect
+import copy
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, NamedTuple, Optional, Tuple
 
-import yaml
+
+# Config parsing is shared with the other services (shared/utils)
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / 'shared' / 'utils'))
+from config_cache import read_yaml_entry  # noqa: E402
+
+# Immutable style tables built from a config, by SHA-256 of its contents and
+# least recently used first; shared by every StyleSelector using that config
+_STYLE_TABLES: "OrderedDict[str, tuple]" = OrderedDict()
+_STYLE_TABLES_SIZE = 100
+
+# Log directories already created by this process
+_ENSURED_DIRS: set = set()
+
+# select_style results kept per StyleSelector
+_RESULT_CACHE_SIZE = 1024
+
+
+def _split_prompt(prompt: str) -> Optional[Tuple[str, ...]]:
+    """Split prompt on {grade}; None if any other braces need str.format."""
+    parts = tuple(prompt.split('{grade}'))
+    if any('{' in part or '}' in part for part in parts):
+        return None
+    return parts
+
+
+class Style(NamedTuple):
+    """Immutable style record used on the selection path."""
+    name: str
+    grade_range: Tuple[int, int]
+    description: str
+    prompt: str
+    # Prompt split around {grade}, or None if it needs str.format
+    prompt_parts: Optional[Tuple[str, ...]] = None
 
 
 class StyleSelector:
@@ -27,18 +65,27 @@ class StyleSelector:
             config_path: Path to configuration file
         """
         self.config = self._load_config(config_path)
-        self.styles = self._parse_styles(self.config['styles'])
+        table = _STYLE_TABLES.get(self._config_digest)
+        if table is None:
+            table = _STYLE_TABLES[self._config_digest] = self._build_style_table(self.config['styles'])
+            if len(_STYLE_TABLES) > _STYLE_TABLES_SIZE:
+                _STYLE_TABLES.popitem(last=False)
+        else:
+            _STYLE_TABLES.move_to_end(self._config_digest)
+        self.styles, self._styles_by_name, self._lower_bounds, self._styles_by_bound = table
+        # Results by (grade type, grade); the type matters because 85 and
+        # 85.0 are equal keys but render differently
+        self._result_cache: Dict[Tuple[type, float], Mapping[str, str]] = {}
         self._setup_logging()
 
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            self._config_digest, config = read_yaml_entry(config_path, 'STYLE_SELECTOR_NO_CACHE')
+            # Copy so callers can't mutate the shared parse
+            return copy.deepcopy(config)
         except FileNotFoundError:
             raise FileNotFoundError(f"Config file not found: {config_path}")
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML in config file: {e}")
 
     def _parse_styles(self, styles_config: List[Dict]) -> List[Dict]:
         """Parse and validate style configurations."""
@@ -52,26 +99,88 @@ class StyleSelector:
             })
         return parsed
 
+    def _build_style_table(self, styles_config: List[Dict]) -> tuple:
+        """
+        Build the read-only style table shared by selectors of one config.
+
+        Returns:
+            (styles, styles by name, sorted lower bounds, Style records by bound)
+        """
+        styles = tuple(MappingProxyType(style) for style in self._parse_styles(styles_config))
+        # Looked up on every selection, so index by name once
+        styles_by_name = MappingProxyType({style['name']: style for style in styles})
+        lower_bounds, styles_by_bound = self._build_thresholds(styles)
+        return styles, styles_by_name, tuple(lower_bounds), tuple(styles_by_bound)
+
+    @staticmethod
+    def _build_thresholds(styles: List[Dict]) -> Tuple[List[float], List[Style]]:
+        """
+        Sort styles by lower grade bound for bisect lookups.
+
+        The public style dicts are kept as they are; selection works on
+        Style records, whose fields are read by attribute.
+
+        Raises:
+            ValueError: If the grade ranges leave gaps, overlap, or do not span 0-100
+        """
+        ordered = sorted(styles, key=lambda style: style['grade_range'][0])
+        if not ordered or ordered[0]['grade_range'][0] != 0 or ordered[-1]['grade_range'][1] != 100:
+            raise ValueError("Style grade ranges must span 0-100")
+        for prev, style in zip(ordered, ordered[1:]):
+            if style['grade_range'][0] != prev['grade_range'][1] + 1:
+                raise ValueError(
+                    f"Grade ranges of '{prev['name']}' and '{style['name']}' must be contiguous"
+                )
+        records = [
+            Style(style['name'], tuple(style['grade_range']), style['description'],
+                  style['prompt'], _split_prompt(style['prompt']))
+            for style in ordered
+        ]
+        return [style.grade_range[0] for style in records], records
+
     def _setup_logging(self):
         """Configure logging based on config settings."""
         log_config = self.config.get('logging', {})
         log_level = getattr(logging, log_config.get('level', 'INFO'))
         log_file = log_config.get('file', './logs/style_selector.log')
 
-        # Create logs directory if it doesn't exist
-        log_dir = Path(log_file).parent
-        log_dir.mkdir(parents=True, exist_ok=True)
-
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        # basicConfig is a no-op once the root logger has handlers, so only
+        # build (and open) new ones the first time
+        if not logging.getLogger().handlers:
+            # A falsy file or console: false turns that handler off
+            handlers = []
+            if log_file:
+                # Create logs directory if it doesn't exist
+                log_dir = str(Path(log_file).parent)
+                if log_dir not in _ENSURED_DIRS:
+                    os.makedirs(log_dir, exist_ok=True)
+                    _ENSURED_DIRS.add(log_dir)
+                handlers.append(logging.handlers.RotatingFileHandler(
+                    log_file,
+                    maxBytes=log_config.get('max_bytes', 10_000_000),
+                    backupCount=log_config.get('backup_count', 3)
+                ))
+            if log_config.get('console', True):
+                handlers.append(logging.StreamHandler(sys.stdout))
+
+            # select_style runs once per record on the feedback path, so its
+            # records go through a SimpleQueue to a listener thread that
+            # does the writing
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            log_queue = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(log_queue, *handlers)
+            listener.start()
+            atexit.register(listener.stop)
+
+            # The root logger only sees the queue; timestamps come from the
+            # formatter set on the listener's handlers above
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            queue_handler.setFormatter(logging.Formatter('%(message)s'))
+            logging.basicConfig(level=log_level, handlers=[queue_handler])
         self.logger = logging.getLogger(self.config['service']['name'])
-        self.logger.info(f"Style Selector v{self.config['service']['version']} initialized")
+        self.logger.info("Style Selector v%s initialized", self.config['service']['version'])
 
     def select_style(self, grade: float) -> Dict[str, str]:
         """
@@ -81,7 +190,7 @@ class StyleSelector:
             grade: Student grade (0-100)
 
         Returns:
-            Dictionary containing:
+            Dictionary (a fresh copy of the cached result) containing:
                 - style_name: Name of the selected style
                 - style_description: Description of the style
                 - prompt_template: Template prompt for feedback generation
@@ -89,40 +198,78 @@ class StyleSelector:
         Raises:
             ValueError: If grade is outside valid range
         """
+        self.logger.info("Selecting style for grade: %s", grade)
+        result = self._select(grade)
+        self.logger.info("Selected style: %s", result['style_name'])
+        return dict(result)
+
+    def select_style_batch(self, grades: List[float]) -> List[Dict[str, str]]:
+        """
+        Select styles for many grades at once.
+
+        Same results as calling select_style per grade, with one log line
+        for the whole batch.
+
+        Args:
+            grades: Student grades (0-100)
+
+        Returns:
+            One select_style result per grade, in order
+
+        Raises:
+            ValueError: If any grade is outside valid range
+        """
+        results = [dict(self._select(grade)) for grade in grades]
+        self.logger.info("Selected styles for %d grades", len(results))
+        return results
+
+    def clear_cache(self) -> None:
+        """Forget cached select_style results, e.g. for test isolation."""
+        self._result_cache.clear()
+
+    def _select(self, grade: float) -> Mapping[str, str]:
+        """Validate grade and return its (cached) select_style result."""
         # Validate input
         if not isinstance(grade, (int, float)):
             raise ValueError(f"Grade must be a number, got {type(grade)}")
 
-        if grade < 0 or grade > 100:
+        # Chained so NaN, which fails every comparison, is rejected too
+        if not 0 <= grade <= 100:
             raise ValueError(f"Grade must be between 0 and 100, got {grade}")
 
-        self.logger.info(f"Selecting style for grade: {grade}")
+        key = (type(grade), grade)
+        result = self._result_cache.get(key)
+        if result is not None:
+            return result
 
-        # Selection logic as per PRD
-        if grade >= 90:
-            selected_style = self._get_style_by_name("trump")
-        elif grade >= 70:
-            selected_style = self._get_style_by_name("hason")
-        elif grade >= 55:
-            selected_style = self._get_style_by_name("constructive")
-        else:
-            selected_style = self._get_style_by_name("amsalem")
+        # Last style whose lower bound is <= grade; fractional grades
+        # between two ranges (e.g. 89.5) stay with the lower style
+        idx = bisect.bisect_right(self._lower_bounds, grade) - 1
+        selected_style = self._styles_by_bound[idx]
 
-        result = {
-            "style_name": selected_style['name'],
-            "style_description": selected_style['description'],
-            "prompt_template": selected_style['prompt'].format(grade=grade)
-        }
-
-        self.logger.info(f"Selected style: {result['style_name']}")
+        if selected_style.prompt_parts is not None:
+            # Same text str.format would produce, without parsing the template
+            prompt = str(grade).join(selected_style.prompt_parts)
+        else:
+            prompt = selected_style.prompt.format(grade=grade)
+
+        result = MappingProxyType({
+            "style_name": selected_style.name,
+            "style_description": selected_style.description,
+            "prompt_template": prompt
+        })
+        if len(self._result_cache) >= _RESULT_CACHE_SIZE:
+            # Drop the oldest entry
+            del self._result_cache[next(iter(self._result_cache))]
+        self._result_cache[key] = result
         return result
 
-    def _get_style_by_name(self, name: str) -> Dict:
+    def _get_style_by_name(self, name: str) -> Mapping:
         """Get style configuration by name."""
-        for style in self.styles:
-            if style['name'] == name:
-                return style
-        raise ValueError(f"Style not found: {name}")
+        try:
+            return self._styles_by_name[name]
+        except KeyError:
+            raise ValueError(f"Style not found: {name}")
 
     def process(self, input_data: Dict[str, Any]) -> Dict[str, str]:
         """
@@ -143,6 +290,8 @@ class StyleSelector:
 
 def main():
     """Main entry point for standalone execution."""
+    import argparse
+
     parser = argparse.ArgumentParser(description='Style Selector Service')
     parser.add_argument('--grade', type=float, required=True,
                        help='Student grade (0-100)')
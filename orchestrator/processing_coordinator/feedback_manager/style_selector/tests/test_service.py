@@ -3,6 +3,7 @@ Test suite for Style Selector Service
 Tests all grade ranges and edge cases
 """
 
+import json
 import pytest
 import sys
 from pathlib import Path
@@ -11,14 +12,15 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from service import StyleSelector
+from config_cache import _YAML_CACHE, read_yaml
 
 
 class TestStyleSelector:
     """Test cases for StyleSelector service."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def service(self):
-        """Create a StyleSelector instance for testing."""
+        """Create one StyleSelector shared by all tests; it is not mutated after init."""
         return StyleSelector(config_path="config.yaml")
 
     def test_initialization(self, service):
@@ -158,6 +160,11 @@ class TestStyleSelector:
         with pytest.raises(ValueError, match="between 0 and 100"):
             service.select_style(101)
 
+    def test_invalid_grade_nan(self, service):
+        """Test that NaN grades raise ValueError."""
+        with pytest.raises(ValueError, match="between 0 and 100"):
+            service.select_style(float('nan'))
+
     def test_invalid_grade_type_string(self, service):
         """Test that string grades raise ValueError."""
         with pytest.raises(ValueError, match="must be a number"):
@@ -197,6 +204,86 @@ class TestStyleSelector:
             assert 'prompt' in style
             assert len(style['grade_range']) == 2
 
+    def test_select_style_batch_matches_single_selection(self, service):
+        """Test batch selection returns the per-grade results in order."""
+        grades = [100, 89.5, 55, 0, 72]
+        assert service.select_style_batch(grades) == [service.select_style(g) for g in grades]
+
+    def test_select_style_batch_invalid_grade(self, service):
+        """Test batch selection rejects out-of-range grades."""
+        with pytest.raises(ValueError, match="between 0 and 100"):
+            service.select_style_batch([80, 101])
+
+    def test_result_cached_per_grade(self, service):
+        """Test repeated grades reuse one cached result, keeping int/float output."""
+        first = service.select_style(85)
+        assert service._select(85) is service._select(85)
+        assert '85/100' in first['prompt_template']
+        assert '85.0/100' in service.select_style(85.0)['prompt_template']
+
+        service.clear_cache()
+        assert service._select(85) == first
+
+    def test_select_style_returns_plain_dict(self, service):
+        """Test callers get a dict they can mutate and serialize."""
+        result = service.select_style(85)
+        assert type(result) is dict
+        assert json.loads(json.dumps(result)) == result
+        result['style_name'] = 'changed'
+        assert service.select_style(85)['style_name'] == 'hason'
+        assert all(type(r) is dict for r in service.select_style_batch([40, 95]))
+
+    def test_json_config_cache_used_on_warm_start(self, tmp_path, monkeypatch):
+        """Test a later process reads the JSON copy while the YAML is unchanged."""
+        monkeypatch.delenv('STYLE_SELECTOR_NO_CACHE', raising=False)
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(Path("config.yaml").read_text())
+        _YAML_CACHE.clear()
+        StyleSelector(config_path=str(config_file))
+
+        json_cache = tmp_path / "config.yaml.cache.json"
+        cached = json.loads(json_cache.read_text())
+        cached['config']['service']['name'] = 'from_json_cache'
+        json_cache.write_text(json.dumps(cached))
+        _YAML_CACHE.clear()
+
+        assert StyleSelector(config_path=str(config_file)).config['service']['name'] == 'from_json_cache'
+
+    def test_split_prompts_match_str_format(self, service):
+        """Test pre-split prompts render exactly like str.format."""
+        for grade in (0, 54.5, 70, 89.9, 100):
+            style = next(s for s in service.styles if s['name'] == service.select_style(grade)['style_name'])
+            assert service.select_style(grade)['prompt_template'] == style['prompt'].format(grade=grade)
+
+    def test_style_table_shared_between_instances(self, service):
+        """Test selectors built from the same config share one read-only style table."""
+        other = StyleSelector(config_path="config.yaml")
+        assert other.styles is service.styles
+        with pytest.raises(TypeError):
+            other.styles[0]['name'] = 'changed'
+
+    def test_grade_ranges_must_be_contiguous(self):
+        """Test style ranges with a gap are rejected."""
+        styles = [
+            {'name': 'low', 'grade_range': (0, 49)},
+            {'name': 'high', 'grade_range': (60, 100)},
+        ]
+        with pytest.raises(ValueError, match="contiguous"):
+            StyleSelector._build_thresholds(styles)
+
+    def test_config_reparsed_only_when_contents_change(self, tmp_path):
+        """Test identical config contents share a parse and edits are picked up."""
+        original = Path("config.yaml").read_text()
+        first = tmp_path / "first.yaml"
+        second = tmp_path / "second.yaml"
+        first.write_text(original)
+        second.write_text(original)
+
+        assert read_yaml(first) is read_yaml(second)
+
+        second.write_text(original.replace("name: style_selector", "name: edited_selector", 1))
+        assert StyleSelector(config_path=str(second)).config['service']['name'] == 'edited_selector'
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
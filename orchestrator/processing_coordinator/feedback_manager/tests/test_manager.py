@@ -4,13 +4,17 @@ Tests for Feedback Manager service.
 
 import pytest
 from pathlib import Path
-from unittest.mock import Mock, patch
+import asyncio
+import os
+import yaml
+from unittest.mock import AsyncMock, Mock, patch
 import sys
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from service import FeedbackManager
+from config_cache import _YAML_CACHE
 
 
 class TestFeedbackManager:
@@ -160,10 +164,10 @@ logging:
 
         # First call succeeds, second fails
         mock_gemini_instance = Mock()
-        mock_gemini_instance.process.side_effect = [
+        mock_gemini_instance.aprocess = AsyncMock(side_effect=[
             {'feedback': 'Great!', 'status': 'Success', 'error': None, 'tokens_used': 30},
             {'feedback': None, 'status': 'Failed', 'error': 'Timeout', 'tokens_used': 0}
-        ]
+        ])
         mock_gemini.return_value = mock_gemini_instance
 
         manager = FeedbackManager(config_path=config_path)
@@ -194,5 +198,171 @@ logging:
         assert result['failed_count'] == 0
 
 
+    @patch.object(FeedbackManager, '_initialize_child_services')
+    def test_config_parse_cached_until_file_changes(self, mock_init, config_path):
+        """Test an unchanged config is parsed once and edits are picked up."""
+        _YAML_CACHE.clear()
+        with patch('yaml.load', wraps=yaml.load) as mock_load:
+            first = FeedbackManager(config_path=config_path)
+            first.config['manager']['name'] = 'mutated'
+            second = FeedbackManager(config_path=config_path)
+            assert mock_load.call_count == 1
+            assert second.config['manager']['name'] == 'feedback_manager'
+
+            # Edited contents are re-parsed even with an older mtime
+            stat = os.stat(config_path)
+            with open(config_path, 'a') as f:
+                f.write("\n# edited\n")
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 1_000_000_000))
+            FeedbackManager(config_path=config_path)
+            assert mock_load.call_count == 2
+
+    @patch.object(FeedbackManager, '_initialize_child_services')
+    def test_json_config_cache_used_on_warm_start(self, mock_init, config_path, monkeypatch):
+        """Test a fresh process reads the JSON copy instead of re-parsing YAML."""
+        monkeypatch.delenv('FEEDBACK_MGR_NO_CACHE', raising=False)
+        _YAML_CACHE.clear()
+        FeedbackManager(config_path=config_path)
+        assert Path(config_path + '.cache.json').exists()
+
+        # Simulate a new process: drop the in-memory cache
+        _YAML_CACHE.clear()
+        with patch('yaml.load') as mock_load:
+            manager = FeedbackManager(config_path=config_path)
+
+        mock_load.assert_not_called()
+        assert manager.config['manager']['name'] == 'feedback_manager'
+
+    @patch.object(FeedbackManager, '_initialize_child_services')
+    def test_process_runs_records_concurrently(self, mock_init, config_path):
+        """Test records are generated concurrently and returned in input order."""
+        manager = FeedbackManager(config_path=config_path)
+        manager.style_selector = Mock()
+        manager.style_selector.process.return_value = {
+            'style_name': 'hason',
+            'prompt_template': 'Generate feedback'
+        }
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_aprocess(gemini_input):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            email_id = gemini_input['context']['email_id']
+            return {'feedback': f'Reply for {email_id}', 'status': 'Success', 'error': None, 'tokens_used': 1}
+
+        manager.gemini_generator = Mock()
+        manager.gemini_generator.aprocess = fake_aprocess
+
+        records = [{'email_id': f'student{i}@example.com', 'grade': 80.0} for i in range(6)]
+        result = manager.process(records)
+
+        assert [r['reply'] for r in result['feedback']] == [
+            f'Reply for student{i}@example.com' for i in range(6)
+        ]
+        assert result['generated_count'] == 6
+        assert 1 < peak <= 4
+
+    @patch.object(FeedbackManager, '_initialize_child_services')
+    def test_process_batches_records(self, mock_init, config_path):
+        """Test batching sends chunks of records through process_batch."""
+        manager = FeedbackManager(config_path=config_path)
+        manager.config['batching'] = {'enabled': True, 'size': 2}
+        manager.style_selector = Mock()
+        manager.style_selector.process.return_value = {
+            'style_name': 'hason',
+            'prompt_template': 'Generate feedback'
+        }
+        manager.gemini_generator = Mock()
+        manager.gemini_generator.process_batch.side_effect = lambda inputs: [
+            {'feedback': f"Reply for {x['context']['email_id']}", 'status': 'Success', 'error': None, 'tokens_used': 1}
+            for x in inputs
+        ]
+
+        records = [{'email_id': f'student{i}@example.com', 'grade': 80.0} for i in range(3)]
+        result = manager.process(records)
+
+        assert [r['reply'] for r in result['feedback']] == [
+            f'Reply for student{i}@example.com' for i in range(3)
+        ]
+        assert manager.gemini_generator.process_batch.call_count == 2
+
+    @patch.object(FeedbackManager, '_initialize_child_services')
+    def test_reply_cache_reuses_only_identical_requests(self, mock_init, config_path):
+        """Test cached replies are reused for identical requests, never another record's."""
+        manager = FeedbackManager(config_path=config_path)
+        manager.config['reply_cache'] = {'enabled': True}
+        manager.style_selector = Mock()
+        manager.style_selector.process.side_effect = lambda x: {
+            'style_name': 'trump' if x['grade'] >= 90 else 'hason',
+            'prompt_template': 'Generate feedback'
+        }
+        manager.gemini_generator = Mock()
+        manager.gemini_generator.aprocess = AsyncMock(side_effect=lambda x: {
+            'feedback': f"Reply for {x['context']['email_id']} ({x['context']['grade']})",
+            'status': 'Success', 'error': None, 'tokens_used': 1
+        })
+
+        result = manager.process([
+            {'email_id': 'a@example.com', 'grade': 85.0},
+            {'email_id': 'b@example.com', 'grade': 85.0},
+            {'email_id': 'c@example.com', 'grade': 85.2},
+            {'email_id': 'a@example.com', 'grade': 85.0},
+        ])
+        again = manager.process([{'email_id': 'c@example.com', 'grade': 85.2}])
+
+        assert [r['reply'] for r in result['feedback']] == [
+            'Reply for a@example.com (85.0)',
+            'Reply for b@example.com (85.0)',
+            'Reply for c@example.com (85.2)',
+            'Reply for a@example.com (85.0)',
+        ]
+        assert again['feedback'][0]['reply'] == 'Reply for c@example.com (85.2)'
+        assert manager.gemini_generator.aprocess.call_count == 3
+        assert manager.health_check()['reply_cache'] == '3 entries, 2 hits, 3 misses'
+
+    @patch.object(FeedbackManager, '_initialize_child_services')
+    def test_process_skips_records_without_grade(self, mock_init, config_path):
+        """Test records with no grade fail without calling child services."""
+        manager = FeedbackManager(config_path=config_path)
+        manager.style_selector = Mock()
+        manager.style_selector.process.return_value = {
+            'style_name': 'hason',
+            'prompt_template': 'Generate feedback'
+        }
+        manager.gemini_generator = Mock()
+        manager.gemini_generator.aprocess = AsyncMock(return_value={
+            'feedback': 'Great work', 'status': 'Success', 'error': None, 'tokens_used': 1
+        })
+
+        result = manager.process([
+            {'email_id': 'a@example.com', 'grade': None},
+            {'email_id': 'b@example.com', 'grade': 80.0},
+        ])
+
+        assert result['feedback'][0] == {
+            'email_id': 'a@example.com', 'reply': None,
+            'status': 'Missing: reply', 'error': 'grade missing'
+        }
+        assert result['feedback'][1]['reply'] == 'Great work'
+        assert result['failed_count'] == 1
+        manager.style_selector.process.assert_called_once_with({'grade': 80.0})
+
+    @patch.object(FeedbackManager, '_initialize_child_services')
+    def test_child_modules_loaded_once(self, mock_init, config_path, tmp_path):
+        """Test a child module file is executed once and shared across instances."""
+        module_file = tmp_path / "child_service.py"
+        module_file.write_text("LOADS = []\nLOADS.append(1)\n")
+
+        first = FeedbackManager(config_path=config_path)._load_module_from_path("child_service", module_file)
+        second = FeedbackManager(config_path=config_path)._load_module_from_path("child_service", module_file)
+
+        assert first is second
+        assert first.LOADS == [1]
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -3,9 +3,9 @@ Grade Manager - Main Entry Point
 Standalone execution for the grade manager service.
 """
 
-import argparse
 import sys
 import os
+from types import SimpleNamespace
 
 # Add the parent directory to the path to allow imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -13,8 +13,15 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from service import GradeManagerService
 
 
-def main():
-    """Main entry point for standalone execution."""
+def parse_args(argv):
+    """Parse CLI flags; a bare invocation skips argparse entirely."""
+    if not argv:
+        # Health check with the default config
+        return SimpleNamespace(input=None, output=None, config='config.yaml',
+                               workers=None, fast_xlsx=False, verbose=False)
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='Grade Manager - Orchestrates repository grading'
     )
@@ -39,34 +46,104 @@ def main():
         help='Number of parallel workers (overrides config)',
         default=None
     )
+    parser.add_argument(
+        '--fast-xlsx',
+        action='store_true',
+        help='Read the input with the streaming XML reader instead of openpyxl'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
         help='Enable verbose output'
     )
 
-    args = parser.parse_args()
+    return parser.parse_args(argv)
 
-    print("=" * 60)
-    print("Grade Manager v1.0.0")
-    print("=" * 60)
-    print(f"Config file: {args.config}")
 
-    if args.input:
-        print(f"Input file: {args.input}")
-    else:
-        print("Input file: (none - health check mode)")
+def _iter_records(rows):
+    """Yield email records from row tuples; the first row is the header."""
+    header_row = next(rows, None)
+    if header_row is None:
+        raise ValueError("Input file is empty")
 
-    if args.output:
-        print(f"Output file: {args.output}")
-    else:
-        print("Output file: (from config)")
+    headers = [str(h) if h else f"col_{i}" for i, h in enumerate(header_row)]
+    width = len(headers)
+    for row in rows:
+        if any(row):
+            # The fast reader drops trailing empty cells; every record
+            # still gets every column
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            yield dict(zip(headers, row))
+
+
+def iter_email_records(path, fast_xlsx=False):
+    """Stream email records from an XLSX file.
+
+    Raises:
+        ValueError: If the sheet has no header row
+    """
+    if fast_xlsx:
+        from fast_xlsx import FastXlsxError, iter_xlsx_rows
+        started = False
+        try:
+            for record in _iter_records(iter_xlsx_rows(path)):
+                started = True
+                yield record
+            return
+        except FastXlsxError as e:
+            # Records already handed out can't be taken back
+            if started:
+                raise
+            print(f"Fast XLSX reader failed ({e}), falling back to openpyxl")
+
+    from openpyxl import load_workbook
+    # Stream rows straight into records; read-only workbooks keep a file
+    # handle open until closed
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from _iter_records(wb.active.iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+
+def iter_batches(records, size):
+    """Group an iterable of records into lists of at most size records."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def main():
+    """Main entry point for standalone execution."""
+    args = parse_args(sys.argv[1:])
+
+    if args.verbose:
+        print("=" * 60)
+        print("Grade Manager v1.0.0")
+        print("=" * 60)
+        print(f"Config file: {args.config}")
+
+        if args.input:
+            print(f"Input file: {args.input}")
+        else:
+            print("Input file: (none - health check mode)")
 
-    if args.workers:
-        print(f"Workers: {args.workers}")
+        if args.output:
+            print(f"Output file: {args.output}")
+        else:
+            print("Output file: (from config)")
 
-    print("=" * 60)
-    print()
+        if args.workers:
+            print(f"Workers: {args.workers}")
+
+        print("=" * 60)
+        print()
 
     # Initialize service
     service = GradeManagerService(config_path=args.config)
@@ -74,24 +151,27 @@ def main():
     if args.input:
         # Process input file
         try:
-            from openpyxl import load_workbook
-            wb = load_workbook(args.input)
-            ws = wb.active
-
-            rows = list(ws.iter_rows(values_only=True))
-            if not rows:
-                print("Error: Input file is empty")
-                return 1
-
-            headers = [str(h) if h else f"col_{i}" for i, h in enumerate(rows[0])]
-            email_records = [
-                dict(zip(headers, row)) for row in rows[1:] if any(row)
-            ]
-
-            print(f"Loaded {len(email_records)} email records")
-
-            # Process records
-            result = service.process({'email_records': email_records})
+            parallelism = service.config.setdefault('parallelism', {})
+            if args.workers:
+                parallelism['max_workers'] = args.workers
+            # Hand records to the grader in batches while the sheet is still
+            # being read, so cloning starts right away
+            batch_size = parallelism.get(
+                'batch_size', parallelism.get('max_workers', 5) * 4
+            )
+
+            loaded = 0
+
+            def counted(records):
+                nonlocal loaded
+                for record in records:
+                    loaded += 1
+                    yield record
+
+            records = counted(iter_email_records(args.input, fast_xlsx=args.fast_xlsx))
+            result = service.process_batches(iter_batches(records, batch_size))
+
+            print(f"Loaded {loaded} email records")
 
             print()
             print("=" * 60)
@@ -0,0 +1,132 @@
+"""
+Fast XLSX Row Reader
+Streams cell values straight from the sheet XML, skipping openpyxl's cell
+objects. Used by the CLI's --fast-xlsx flag.
+
+Only values are read: styles are ignored, so dates come back as Excel
+serial numbers and formulas as their cached results.
+"""
+
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Any, Iterator, List, Optional, Tuple
+
+_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# Errors raised while decoding the archive or its XML; reported as
+# FastXlsxError so they can't be confused with the caller's own errors
+_PARSE_ERRORS = (zipfile.BadZipFile, KeyError, ET.ParseError, ValueError,
+                 IndexError, AttributeError)
+
+
+class FastXlsxError(Exception):
+    """The file is not a workbook this reader understands; use openpyxl."""
+
+
+def _first_sheet_path(archive: zipfile.ZipFile) -> str:
+    """Return the archive path of the workbook's first worksheet."""
+    workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+    sheet = workbook.find(f'{_NS}sheets/{_NS}sheet')
+    rel_id = sheet.get(f'{_REL_NS}id')
+
+    rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    for rel in rels.iter(f'{_PKG_REL_NS}Relationship'):
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target')
+            if target.startswith('/'):
+                return target.lstrip('/')
+            return posixpath.normpath(posixpath.join('xl', target))
+    raise KeyError(f"Worksheet relationship not found: {rel_id}")
+
+
+def _read_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    """Load the shared string table, one entry per <si>."""
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as f:
+        for _, element in ET.iterparse(f):
+            if element.tag == f'{_NS}si':
+                # Plain text is a direct <t>; rich text is a run of <r><t>
+                text = element.find(f'{_NS}t')
+                if text is not None:
+                    strings.append(text.text or '')
+                else:
+                    strings.append(''.join(
+                        run.findtext(f'{_NS}t', '') for run in element.findall(f'{_NS}r')
+                    ))
+                element.clear()
+    return strings
+
+
+def _column_index(ref: str) -> int:
+    """Convert a cell reference such as 'C7' to a 0-based column index."""
+    index = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - ord('A') + 1
+    return index - 1
+
+
+def _cell_value(cell: ET.Element, shared_strings: List[str]) -> Any:
+    """Decode one <c> element to a Python value."""
+    cell_type = cell.get('t')
+    if cell_type == 'inlineStr':
+        inline = cell.find(f'{_NS}is')
+        return None if inline is None else ''.join(t.text or '' for t in inline.iter(f'{_NS}t'))
+
+    value = cell.findtext(f'{_NS}v')
+    if value is None:
+        return None
+    if cell_type == 's':
+        return shared_strings[int(value)]
+    if cell_type in ('str', 'e'):
+        return value
+    if cell_type == 'b':
+        return value == '1'
+    # Numbers, typed like openpyxl does
+    if '.' in value or 'E' in value or 'e' in value:
+        return float(value)
+    return int(value)
+
+
+def iter_xlsx_rows(path: str) -> Iterator[Tuple[Optional[Any], ...]]:
+    """
+    Yield the first worksheet's rows as value tuples.
+
+    Rows with no cells are skipped and trailing empty cells are not padded.
+
+    Raises:
+        FastXlsxError: If the file is not a readable XLSX workbook
+        OSError: If the file can't be opened
+    """
+    try:
+        yield from _iter_rows(path)
+    except _PARSE_ERRORS as e:
+        raise FastXlsxError(f"{type(e).__name__}: {e}") from e
+
+
+def _iter_rows(path: str) -> Iterator[Tuple[Optional[Any], ...]]:
+    """iter_xlsx_rows without the error translation."""
+    with zipfile.ZipFile(path) as archive:
+        shared_strings = _read_shared_strings(archive)
+        with archive.open(_first_sheet_path(archive)) as f:
+            for _, element in ET.iterparse(f):
+                if element.tag != f'{_NS}row':
+                    continue
+
+                values: List[Any] = []
+                for cell in element.iter(f'{_NS}c'):
+                    ref = cell.get('r')
+                    if ref:
+                        # Skipped columns are empty cells
+                        values.extend([None] * (_column_index(ref) - len(values)))
+                    values.append(_cell_value(cell, shared_strings))
+                yield tuple(values)
+                # Keep memory flat on large sheets
+                element.clear()
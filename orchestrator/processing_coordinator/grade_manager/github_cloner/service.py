@@ -3,19 +3,142 @@ GitHub Cloner Service
 Clones Git repositories from GitHub to local filesystem with timeout protection.
 """
 
+import asyncio
+import atexit
+import contextlib
+import copy
+import hashlib
+import json
 import subprocess
 import os
+import sys
+import threading
 import time
 import shutil
+import uuid
 import logging
+import logging.handlers
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, Optional
-import yaml
+from typing import Dict, List, Optional, Tuple
 
+# Config parsing is shared with the other services (shared/utils)
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / 'shared' / 'utils'))
+from config_cache import read_yaml  # noqa: E402
+
+
+# Directories already created by this process
+_ENSURED_DIRS: set = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """os.makedirs(path, exist_ok=True), done once per directory per process."""
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+# git's stderr is only parsed for an error message; output beyond this is
+# read and dropped so a noisy clone can't grow memory without bound
+_STDERR_LIMIT = 64 * 1024
+
+
+def _read_capped(stream) -> bytes:
+    """Read a pipe to EOF, keeping at most _STDERR_LIMIT bytes."""
+    kept = bytearray()
+    for chunk in iter(lambda: stream.read(8192), b''):
+        if len(kept) < _STDERR_LIMIT:
+            kept += chunk[:_STDERR_LIMIT - len(kept)]
+    stream.close()
+    return bytes(kept)
+
+
+async def _aread_capped(stream) -> bytes:
+    """Async _read_capped for asyncio subprocess pipes."""
+    kept = bytearray()
+    while True:
+        chunk = await stream.read(8192)
+        if not chunk:
+            return bytes(kept)
+        if len(kept) < _STDERR_LIMIT:
+            kept += chunk[:_STDERR_LIMIT - len(kept)]
+
+
+def _run_capped(command: List[str], timeout: float) -> Tuple[int, str]:
+    """Run a command for (returncode, stderr); stdout is discarded.
+
+    Raises:
+        subprocess.TimeoutExpired: After killing the command on timeout
+    """
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    stderr: List[bytes] = []
+    reader = threading.Thread(
+        target=lambda: stderr.append(_read_capped(process.stderr)), daemon=True
+    )
+    reader.start()
+    try:
+        returncode = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        raise
+    reader.join()
+    return returncode, stderr[0].decode(errors='replace') if stderr else ''
+
+# Repository deletions run here so callers don't wait on thousands of unlinks
+_CLEANUP_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cleanup')
+_pending_cleanups: "set[Future]" = set()
+_pending_lock = threading.Lock()
+
+
+def _discard_directory(path: str) -> None:
+    """Delete a directory tree in the background.
+
+    The directory is first renamed aside, which is a single syscall, so its
+    path is free for a new clone as soon as this returns.
+    """
+    trash_path = f"{path}.trash-{uuid.uuid4().hex}"
+    try:
+        os.rename(path, trash_path)
+    except OSError:
+        # Can't rename (e.g. busy on some filesystems): delete in place
+        trash_path = path
+
+    future = _CLEANUP_EXECUTOR.submit(shutil.rmtree, trash_path, ignore_errors=True)
+    with _pending_lock:
+        _pending_cleanups.add(future)
+    future.add_done_callback(_forget_cleanup)
+
+
+def _forget_cleanup(future: Future) -> None:
+    with _pending_lock:
+        _pending_cleanups.discard(future)
+
+
+def wait_for_cleanup(timeout: Optional[float] = None) -> bool:
+    """Block until queued directory deletions finish.
+
+    Args:
+        timeout: Optional maximum seconds to wait
+
+    Returns:
+        True if nothing is left pending
+    """
+    with _pending_lock:
+        pending = list(_pending_cleanups)
+    _, not_done = wait(pending, timeout=timeout)
+    return not not_done
 
 class GitHubClonerService:
     """Service for cloning GitHub repositories."""
 
+    _VALID_PREFIXES = ('https://github.com/', 'http://github.com/')
+
     def __init__(self, config_path: str = "config.yaml"):
         """Initialize the GitHub cloner service.
 
@@ -36,19 +159,25 @@ class GitHubClonerService:
             Configuration dictionary
         """
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            config_path = os.path.abspath(config_path)
+            # Copy so callers can't mutate the shared parse
+            return copy.deepcopy(read_yaml(config_path, 'GITHUB_CLONER_NO_CACHE'))
         except FileNotFoundError:
             # Use default configuration
             return {
                 'service': {'name': 'github_cloner', 'version': '1.0.0'},
-                'git': {'command': 'git', 'clone_args': ['--depth', '1']},
+                'git': {
+                    'command': 'git',
+                    'clone_args': ['--depth', '1', '--single-branch', '--no-tags'],
+                    'sparse_checkout': []
+                },
                 'defaults': {
                     'timeout_seconds': 60,
                     'temp_directory': './data/tmp/repos',
                     'max_workers': 5
                 },
                 'cleanup': {'delete_after_use': True},
+                'cache': {'enabled': False, 'dir': './data/cache/repos'},
                 'logging': {'level': 'INFO', 'file': './logs/github_cloner.log'}
             }
 
@@ -59,11 +188,20 @@ class GitHubClonerService:
         log_file = log_config.get('file', './logs/github_cloner.log')
 
         # Create logs directory if it doesn't exist
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        _ensure_dir(os.path.dirname(log_file))
 
         # Configure logger
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(log_level)
+        # Handled here; don't log again through the root logger's handlers
+        self.logger.propagate = False
+
+        # The logger is shared by every instance in the process; only the
+        # first one attaches handlers, so records aren't written twice
+        self._log_listener = None
+        self._queue_handler = None
+        if any(isinstance(h, logging.handlers.QueueHandler) for h in self.logger.handlers):
+            return
 
         # File handler
         fh = logging.FileHandler(log_file)
@@ -80,8 +218,31 @@ class GitHubClonerService:
         fh.setFormatter(formatter)
         ch.setFormatter(formatter)
 
-        self.logger.addHandler(fh)
-        self.logger.addHandler(ch)
+        # Concurrent clones log progress from many workers; routing records
+        # through one listener keeps the FileHandler lock off the clone path
+        log_queue = queue.Queue(-1)
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, fh, ch, respect_handler_level=True
+        )
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
+
+        # Kept on the instance so close() can detach it; fh and ch format
+        # the record when the listener writes it
+        self._queue_handler = logging.handlers.QueueHandler(log_queue)
+        self._queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        self.logger.addHandler(self._queue_handler)
+
+    def close(self):
+        """Flush queued log records and detach this instance's log handlers."""
+        if self._log_listener is None:
+            return
+        self.logger.removeHandler(self._queue_handler)
+        self._log_listener.stop()
+        for handler in self._log_listener.handlers:
+            handler.close()
+        atexit.unregister(self._log_listener.stop)
+        self._log_listener = None
 
     def _validate_url(self, url: str) -> bool:
         """Validate GitHub URL format.
@@ -92,11 +253,7 @@ class GitHubClonerService:
         Returns:
             True if valid, False otherwise
         """
-        valid_patterns = [
-            'https://github.com/',
-            'http://github.com/'
-        ]
-        return any(url.startswith(pattern) for pattern in valid_patterns)
+        return url.startswith(self._VALID_PREFIXES)
 
     def _normalize_url(self, url: str) -> str:
         """Normalize GitHub URL to include .git extension.
@@ -107,38 +264,34 @@ class GitHubClonerService:
         Returns:
             Normalized URL
         """
-        if not url.endswith('.git'):
-            return f"{url}.git"
-        return url
-
-    def clone_repository(
+        return url if url.endswith('.git') else url + '.git'
+
+    def _invalid_url_result(self, repo_url: str, start_time: float) -> Dict:
+        """Build the failure result for a URL that is not a GitHub URL."""
+        self.logger.error(f"Invalid URL format: {repo_url}")
+        return {
+            'clone_path': None,
+            'status': 'Failed',
+            'error': f'Invalid URL format: {repo_url}. Expected https://github.com/username/repo',
+            'duration_seconds': time.time() - start_time
+        }
+
+    def _prepare_clone(
         self,
         repo_url: str,
-        destination_dir: Optional[str] = None,
-        timeout_seconds: Optional[int] = None
-    ) -> Dict:
-        """Clone a GitHub repository.
+        destination_dir: Optional[str],
+        timeout_seconds: Optional[int]
+    ) -> Tuple[str, str, float, List[str]]:
+        """Resolve the URL, destination, timeout and git command for a clone.
 
         Args:
-            repo_url: GitHub repository URL
+            repo_url: Validated GitHub repository URL
             destination_dir: Optional destination directory
             timeout_seconds: Optional timeout in seconds
 
         Returns:
-            Dictionary with clone_path, status, error, and duration_seconds
+            Tuple of (normalized_url, destination_dir, timeout, command)
         """
-        start_time = time.time()
-
-        # Validate URL
-        if not self._validate_url(repo_url):
-            self.logger.error(f"Invalid URL format: {repo_url}")
-            return {
-                'clone_path': None,
-                'status': 'Failed',
-                'error': f'Invalid URL format: {repo_url}. Expected https://github.com/username/repo',
-                'duration_seconds': time.time() - start_time
-            }
-
         # Normalize URL
         repo_url = self._normalize_url(repo_url)
 
@@ -149,99 +302,389 @@ class GitHubClonerService:
         # Determine destination directory
         if destination_dir is None:
             temp_dir = defaults.get('temp_directory', './data/tmp/repos')
-            # Extract repo name from URL
-            repo_name = repo_url.rstrip('/').rstrip('.git').split('/')[-1]
-            destination_dir = os.path.join(temp_dir, repo_name)
+            # Extract owner and repo name from URL
+            owner, repo_name = repo_url.rstrip('/').split('/')[-2:]
+            if repo_name.endswith('.git'):
+                repo_name = repo_name[:-len('.git')]
+            # Unique per clone: concurrent clones of alice/hw and bob/hw (or
+            # of one repo twice) must not share, or discard, a checkout
+            destination_dir = os.path.join(
+                temp_dir, f"{owner}-{repo_name}-{uuid.uuid4().hex[:8]}"
+            )
 
         # Ensure parent directory exists
-        os.makedirs(os.path.dirname(destination_dir) or '.', exist_ok=True)
+        _ensure_dir(os.path.dirname(destination_dir) or '.')
 
         # Build git clone command
-        git_cmd = self.config.get('git', {}).get('command', 'git')
-        clone_args = self.config.get('git', {}).get('clone_args', ['--depth', '1'])
+        git_config = self.config.get('git', {})
+        git_cmd = git_config.get('command', 'git')
+        clone_args = list(git_config.get('clone_args', ['--depth', '1']))
+        if git_config.get('sparse_checkout'):
+            # Check out only matching files; other blobs are never downloaded
+            clone_args += ['--filter=blob:none', '--sparse']
         command = [git_cmd, 'clone'] + clone_args + [repo_url, destination_dir]
 
         self.logger.info(f"Cloning {repo_url} to {destination_dir} with timeout {timeout}s")
+        return repo_url, destination_dir, timeout, command
+
+    def _sparse_checkout_command(self, destination_dir: str) -> Optional[List[str]]:
+        """Build the command that narrows a --sparse clone, if one is configured."""
+        git_config = self.config.get('git', {})
+        patterns = git_config.get('sparse_checkout') or []
+        if not patterns:
+            return None
+        git_cmd = git_config.get('command', 'git')
+        return [git_cmd, '-C', destination_dir, 'sparse-checkout', 'set', '--no-cone'] + list(patterns)
+
+    def _ls_remote_command(self, repo_url: str) -> Optional[List[str]]:
+        """Build the command resolving the remote HEAD, if the clone cache is on."""
+        if not self.config.get('cache', {}).get('enabled', False):
+            return None
+        git_cmd = self.config.get('git', {}).get('command', 'git')
+        return [git_cmd, 'ls-remote', repo_url, 'HEAD']
+
+    def _cache_entry(self, ls_remote_output: str) -> Optional[Path]:
+        """Map `git ls-remote` output to this commit's clone cache directory.
+
+        The key also covers the clone options, since they decide which files
+        the checkout holds.
+        """
+        sha = ls_remote_output.split()[0] if ls_remote_output.strip() else ''
+        if len(sha) != 40:
+            return None
+
+        git_config = self.config.get('git', {})
+        options = json.dumps([git_config.get('clone_args'), git_config.get('sparse_checkout')])
+        variant = hashlib.sha256(options.encode()).hexdigest()[:8]
+        cache_dir = self.config.get('cache', {}).get('dir', './data/cache/repos')
+        return Path(cache_dir) / sha[:2] / f"{sha}-{variant}"
+
+    def _restore_from_cache(self, entry: Optional[Path], destination_dir: str) -> bool:
+        """Copy a cached checkout to destination_dir; False on a cache miss."""
+        if entry is None or not entry.is_dir():
+            return False
+        try:
+            shutil.copytree(entry, destination_dir, symlinks=True)
+        except OSError as e:
+            self.logger.warning(f"Clone cache restore failed, cloning instead: {e}")
+            if os.path.exists(destination_dir):
+                shutil.rmtree(destination_dir, ignore_errors=True)
+            return False
+        # Eviction goes by mtime, so a hit keeps the entry
+        with contextlib.suppress(OSError):
+            os.utime(entry)
+        return True
+
+    def _store_in_cache(self, entry: Optional[Path], clone_path: str) -> None:
+        """Copy a fresh clone into the cache; failures only cost a later re-clone."""
+        if entry is None or entry.exists():
+            return
+        tmp_path = entry.with_name(f"{entry.name}.tmp-{uuid.uuid4().hex}")
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copytree(clone_path, tmp_path, symlinks=True)
+            # Atomic publish; loses harmlessly to a concurrent writer
+            os.rename(tmp_path, entry)
+        except OSError as e:
+            self.logger.warning(f"Could not cache clone of {clone_path}: {e}")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+        self._evict_cache()
+
+    def _evict_cache(self) -> None:
+        """Trim the clone cache to cache.max_age_days and cache.max_entries.
+
+        Entries older than the age limit go first (including copies left
+        half-written by a crash), then the least recently used beyond the
+        entry limit. Removal happens in the background.
+        """
+        cache_config = self.config.get('cache', {})
+        cache_dir = Path(cache_config.get('dir', './data/cache/repos'))
+        max_entries = cache_config.get('max_entries', 256)
+        oldest_allowed = time.time() - cache_config.get('max_age_days', 7) * 86400
+
+        entries = []
+        try:
+            shards = list(cache_dir.iterdir())
+        except OSError as e:
+            self.logger.warning(f"Could not scan clone cache {cache_dir}: {e}")
+            return
+        for shard in shards:
+            try:
+                for entry in shard.iterdir():
+                    # Already being deleted
+                    if '.trash-' not in entry.name:
+                        entries.append((entry.stat().st_mtime, entry))
+            except OSError:
+                # Evicted or emptied by another process meanwhile
+                continue
+
+        entries.sort()
+        kept = []
+        for mtime, entry in entries:
+            if mtime < oldest_allowed:
+                _discard_directory(str(entry))
+            elif '.tmp-' not in entry.name:
+                kept.append(entry)
+        for entry in kept[:max(0, len(kept) - max_entries)]:
+            _discard_directory(str(entry))
+
+    def _cached_result(self, repo_url: str, destination_dir: str, start_time: float) -> Dict:
+        """Build the result for a clone served from the cache."""
+        self.logger.info(f"Restored {repo_url} from clone cache")
+        return self._clone_result(repo_url, destination_dir, 0, '', start_time)
+
+    def _failed_clone(self, destination_dir: str, error: str, start_time: float) -> Dict:
+        """Remove a partial clone and build its failure result."""
+        if os.path.exists(destination_dir):
+            _discard_directory(destination_dir)
+
+        return {
+            'clone_path': None,
+            'status': 'Failed',
+            'error': error,
+            'duration_seconds': time.time() - start_time
+        }
+
+    def _clone_result(
+        self,
+        repo_url: str,
+        destination_dir: str,
+        returncode: int,
+        stderr: str,
+        start_time: float
+    ) -> Dict:
+        """Build the result of a finished git clone from its exit status."""
+        duration = time.time() - start_time
+
+        if returncode == 0:
+            self.logger.info(f"Successfully cloned {repo_url} in {duration:.2f}s")
+            return {
+                'clone_path': os.path.abspath(destination_dir),
+                'status': 'Success',
+                'error': None,
+                'duration_seconds': duration
+            }
+
+        # Parse error message
+        error_msg = stderr.strip()
+
+        # Check for specific error types
+        if 'Authentication failed' in error_msg or 'access denied' in error_msg.lower():
+            error_type = 'Access denied (private repository or authentication required)'
+        elif 'not found' in error_msg.lower():
+            error_type = 'Repository not found'
+        elif 'network' in error_msg.lower() or 'connection' in error_msg.lower():
+            error_type = 'Network error'
+        else:
+            error_type = error_msg
+
+        self.logger.error(f"Clone failed: {error_type}")
+
+        # Cleanup failed clone directory
+        return self._failed_clone(destination_dir, error_type, start_time)
+
+    def clone_repository(
+        self,
+        repo_url: str,
+        destination_dir: Optional[str] = None,
+        timeout_seconds: Optional[int] = None
+    ) -> Dict:
+        """Clone a GitHub repository.
+
+        Args:
+            repo_url: GitHub repository URL
+            destination_dir: Optional destination directory
+            timeout_seconds: Optional timeout in seconds
+
+        Returns:
+            Dictionary with clone_path, status, error, and duration_seconds
+        """
+        start_time = time.time()
+
+        # Validate URL
+        if not self._validate_url(repo_url):
+            return self._invalid_url_result(repo_url, start_time)
+
+        repo_url, destination_dir, timeout, command = self._prepare_clone(
+            repo_url, destination_dir, timeout_seconds
+        )
 
         try:
+            # Resolve the remote commit (one round trip) to look up the cache
+            cache_entry = None
+            ls_remote = self._ls_remote_command(repo_url)
+            if ls_remote:
+                try:
+                    head = subprocess.run(
+                        ls_remote, capture_output=True, text=True, timeout=timeout
+                    )
+                    if head.returncode == 0:
+                        cache_entry = self._cache_entry(head.stdout)
+                except subprocess.TimeoutExpired:
+                    pass
+                if self._restore_from_cache(cache_entry, destination_dir):
+                    return self._cached_result(repo_url, destination_dir, start_time)
+
             # Execute git clone with timeout
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            returncode, stderr = _run_capped(command, timeout)
 
-            duration = time.time() - start_time
+            sparse_command = self._sparse_checkout_command(destination_dir)
+            if returncode == 0 and sparse_command:
+                # The timeout covers both steps
+                returncode, stderr = _run_capped(
+                    sparse_command, max(timeout - (time.time() - start_time), 0.001)
+                )
 
-            if result.returncode == 0:
-                self.logger.info(f"Successfully cloned {repo_url} in {duration:.2f}s")
-                return {
-                    'clone_path': os.path.abspath(destination_dir),
-                    'status': 'Success',
-                    'error': None,
-                    'duration_seconds': duration
-                }
-            else:
-                # Parse error message
-                error_msg = result.stderr.strip()
-
-                # Check for specific error types
-                if 'Authentication failed' in error_msg or 'access denied' in error_msg.lower():
-                    error_type = 'Access denied (private repository or authentication required)'
-                elif 'not found' in error_msg.lower():
-                    error_type = 'Repository not found'
-                elif 'network' in error_msg.lower() or 'connection' in error_msg.lower():
-                    error_type = 'Network error'
-                else:
-                    error_type = error_msg
-
-                self.logger.error(f"Clone failed: {error_type}")
-
-                # Cleanup failed clone directory
-                if os.path.exists(destination_dir):
-                    shutil.rmtree(destination_dir)
-
-                return {
-                    'clone_path': None,
-                    'status': 'Failed',
-                    'error': error_type,
-                    'duration_seconds': duration
-                }
+            if returncode == 0:
+                self._store_in_cache(cache_entry, destination_dir)
+
+            return self._clone_result(
+                repo_url, destination_dir, returncode, stderr, start_time
+            )
 
         except subprocess.TimeoutExpired:
-            duration = time.time() - start_time
             self.logger.error(f"Clone timeout after {timeout}s")
-
-            # Cleanup on timeout
-            if os.path.exists(destination_dir):
-                shutil.rmtree(destination_dir)
-
-            return {
-                'clone_path': None,
-                'status': 'Failed',
-                'error': f'Clone operation timed out after {timeout} seconds',
-                'duration_seconds': duration
-            }
+            return self._failed_clone(
+                destination_dir,
+                f'Clone operation timed out after {timeout} seconds',
+                start_time
+            )
 
         except Exception as e:
-            duration = time.time() - start_time
             self.logger.error(f"Unexpected error during clone: {str(e)}")
+            return self._failed_clone(destination_dir, f'Unexpected error: {str(e)}', start_time)
+
+    @staticmethod
+    async def _arun(
+        command: List[str],
+        timeout: float,
+        capture_stdout: bool = False
+    ) -> Tuple[int, str, str]:
+        """Run a command for (returncode, stdout, stderr).
+
+        stdout is discarded unless capture_stdout; stderr is capped like
+        _run_capped's. Kills the command and raises asyncio.TimeoutError on
+        timeout.
+        """
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout_read = process.stdout.read() if capture_stdout else asyncio.sleep(0, b'')
+        try:
+            stdout, stderr, _ = await asyncio.wait_for(
+                asyncio.gather(stdout_read, _aread_capped(process.stderr), process.wait()),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        return (process.returncode, stdout.decode(errors='replace'),
+                stderr.decode(errors='replace'))
+
+    async def _aclone_repository(
+        self,
+        repo_url: str,
+        semaphore: asyncio.Semaphore,
+        timeout_seconds: Optional[int] = None
+    ) -> Dict:
+        """Clone one repository without blocking the event loop."""
+        async with semaphore:
+            start_time = time.time()
 
-            # Cleanup on error
-            if os.path.exists(destination_dir):
-                shutil.rmtree(destination_dir)
+            if not self._validate_url(repo_url):
+                return self._invalid_url_result(repo_url, start_time)
 
-            return {
-                'clone_path': None,
-                'status': 'Failed',
-                'error': f'Unexpected error: {str(e)}',
-                'duration_seconds': duration
-            }
+            repo_url, destination_dir, timeout, command = self._prepare_clone(
+                repo_url, None, timeout_seconds
+            )
+
+            try:
+                cache_entry = None
+                ls_remote = self._ls_remote_command(repo_url)
+                if ls_remote:
+                    try:
+                        returncode, stdout, _ = await self._arun(
+                            ls_remote, timeout, capture_stdout=True
+                        )
+                        if returncode == 0:
+                            cache_entry = self._cache_entry(stdout)
+                    except asyncio.TimeoutError:
+                        pass
+                    if await asyncio.to_thread(
+                        self._restore_from_cache, cache_entry, destination_dir
+                    ):
+                        return self._cached_result(repo_url, destination_dir, start_time)
+
+                returncode, _, stderr = await self._arun(command, timeout)
+
+                sparse_command = self._sparse_checkout_command(destination_dir)
+                if returncode == 0 and sparse_command:
+                    returncode, _, stderr = await self._arun(
+                        sparse_command, max(timeout - (time.time() - start_time), 0.001)
+                    )
+
+                if returncode == 0:
+                    await asyncio.to_thread(self._store_in_cache, cache_entry, destination_dir)
+
+                return self._clone_result(
+                    repo_url, destination_dir, returncode, stderr, start_time
+                )
+
+            except asyncio.TimeoutError:
+                self.logger.error(f"Clone timeout after {timeout}s")
+                return self._failed_clone(
+                    destination_dir,
+                    f'Clone operation timed out after {timeout} seconds',
+                    start_time
+                )
+
+            except Exception as e:
+                self.logger.error(f"Unexpected error during clone: {str(e)}")
+                return self._failed_clone(destination_dir, f'Unexpected error: {str(e)}', start_time)
+
+    async def aclone_repositories(
+        self,
+        repo_urls: List[str],
+        timeout_seconds: Optional[int] = None
+    ) -> List[Dict]:
+        """Async variant of clone_repositories for callers already in an event loop."""
+        max_workers = self.config.get('defaults', {}).get('max_workers', 5)
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+        return await asyncio.gather(*(
+            self._aclone_repository(url, semaphore, timeout_seconds)
+            for url in repo_urls
+        ))
+
+    def clone_repositories(
+        self,
+        repo_urls: List[str],
+        timeout_seconds: Optional[int] = None
+    ) -> List[Dict]:
+        """Clone several GitHub repositories concurrently.
+
+        Up to defaults.max_workers git processes run at once, each into its
+        own directory under the default temp directory.
+
+        Args:
+            repo_urls: GitHub repository URLs
+            timeout_seconds: Optional per-clone timeout in seconds
+
+        Returns:
+            One clone_repository-style result per URL, in input order
+        """
+        return asyncio.run(self.aclone_repositories(repo_urls, timeout_seconds))
 
     def cleanup_repository(self, clone_path: str) -> bool:
         """Clean up cloned repository.
 
+        The path is freed immediately; the files are deleted in the
+        background (see wait_for_cleanup).
+
         Args:
             clone_path: Path to cloned repository
 
@@ -250,7 +693,7 @@ class GitHubClonerService:
         """
         try:
             if os.path.exists(clone_path):
-                shutil.rmtree(clone_path)
+                _discard_directory(clone_path)
                 self.logger.info(f"Cleaned up repository at {clone_path}")
                 return True
             else:
@@ -260,6 +703,17 @@ class GitHubClonerService:
             self.logger.error(f"Error during cleanup: {str(e)}")
             return False
 
+    def wait_for_cleanup(self, timeout: Optional[float] = None) -> bool:
+        """Wait for background repository deletions; call before shutdown.
+
+        Args:
+            timeout: Optional maximum seconds to wait
+
+        Returns:
+            True if nothing is left pending
+        """
+        return wait_for_cleanup(timeout)
+
     def process(self, input_data: Dict) -> Dict:
         """Process clone request (interface for parent service).
 
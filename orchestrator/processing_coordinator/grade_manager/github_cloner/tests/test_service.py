@@ -2,7 +2,9 @@
 Unit tests for GitHub Cloner Service
 """
 
+import logging.handlers
 import os
+import time
 import sys
 import pytest
 import tempfile
@@ -44,7 +46,10 @@ logging:
   file: "{tmp_path}/logs/test.log"
 """
         config_path.write_text(config_content)
-        return GitHubClonerService(config_path=str(config_path))
+        service = GitHubClonerService(config_path=str(config_path))
+        yield service
+        # Let the next test's service attach handlers for its own log file
+        service.close()
 
     def test_service_initialization(self, service):
         """Test service initialization."""
@@ -52,6 +57,27 @@ logging:
         assert service.config['service']['name'] == 'github_cloner'
         assert service.logger is not None
 
+    def test_close_flushes_queued_logs(self, service, tmp_path):
+        """Test that close() writes queued records and detaches the handler."""
+        service.logger.info("queued message")
+        service.close()
+
+        assert "queued message" in (tmp_path / "logs" / "test.log").read_text()
+        assert service._queue_handler not in service.logger.handlers
+        service.close()  # Idempotent
+
+    def test_repeated_instances_share_handlers(self, service, tmp_path):
+        """Test that later instances don't attach another set of handlers."""
+        config_path = tmp_path / "test_config.yaml"
+        for _ in range(3):
+            GitHubClonerService(config_path=str(config_path))
+
+        queue_handlers = [
+            h for h in service.logger.handlers
+            if isinstance(h, logging.handlers.QueueHandler)
+        ]
+        assert queue_handlers == [service._queue_handler]
+
     def test_validate_url_valid(self, service):
         """Test URL validation with valid URLs."""
         assert service._validate_url("https://github.com/user/repo") is True
@@ -121,6 +147,65 @@ logging:
         assert result['status'] == 'Failed'
         assert 'timeout' in result['error'].lower()
 
+    def test_sparse_checkout_commands(self, service, tmp_path):
+        """Test that sparse_checkout clones partially, then narrows the checkout."""
+        calls = tmp_path / "calls.txt"
+        fake_git = tmp_path / "fake_git"
+        fake_git.write_text(f'#!/bin/sh\necho "$@" >> {calls}\n')
+        fake_git.chmod(0o755)
+        service.config['git']['command'] = str(fake_git)
+        service.config['git']['sparse_checkout'] = ['*.py']
+        dest = str(tmp_path / "sparse")
+
+        result = service.clone_repository("https://github.com/user/repo", destination_dir=dest)
+
+        assert result['status'] == 'Success'
+        clone_call, sparse_call = calls.read_text().splitlines()
+        assert '--filter=blob:none --sparse' in clone_call
+        assert sparse_call == f"-C {dest} sparse-checkout set --no-cone *.py"
+
+    def test_clone_cache_skips_second_clone(self, service, tmp_path):
+        """Test that a repeat clone of the same commit is copied from the cache."""
+        calls = tmp_path / "calls.txt"
+        fake_git = tmp_path / "fake_git"
+        fake_git.write_text(
+            "#!/bin/sh\n"
+            f'echo "$1" >> {calls}\n'
+            'if [ "$1" = ls-remote ]; then echo "' + "a" * 40 + '\tHEAD"; exit 0; fi\n'
+            'for last; do :; done\n'
+            'mkdir -p "$last" && echo "x = 1" > "$last/module.py"\n'
+        )
+        fake_git.chmod(0o755)
+        service.config['git']['command'] = str(fake_git)
+        service.config['cache'] = {'enabled': True, 'dir': str(tmp_path / "cache")}
+
+        first = service.clone_repository(
+            "https://github.com/user/repo", destination_dir=str(tmp_path / "one"))
+        second = service.clone_repository(
+            "https://github.com/user/repo", destination_dir=str(tmp_path / "two"))
+
+        assert first['status'] == second['status'] == 'Success'
+        assert (tmp_path / "two" / "module.py").read_text() == "x = 1\n"
+        assert calls.read_text().split() == ['ls-remote', 'clone', 'ls-remote']
+
+    def test_clone_cache_evicts_old_and_excess_entries(self, service, tmp_path):
+        """Test that the clone cache drops expired, then least recently used, entries."""
+        cache_dir = tmp_path / "cache"
+        service.config['cache'] = {
+            'enabled': True, 'dir': str(cache_dir), 'max_entries': 2, 'max_age_days': 7
+        }
+        now = time.time()
+        ages = {'expired': 30 * 86400, 'oldest': 300, 'middle': 200, 'newest': 100}
+        for name, age in ages.items():
+            entry = cache_dir / "aa" / name
+            entry.mkdir(parents=True)
+            os.utime(entry, (now - age, now - age))
+
+        service._evict_cache()
+        assert service.wait_for_cleanup(timeout=5)
+
+        assert sorted(p.name for p in (cache_dir / "aa").iterdir()) == ['middle', 'newest']
+
     def test_cleanup_repository(self, service, tmp_path):
         """Test repository cleanup."""
         # Create a dummy directory
@@ -132,6 +217,10 @@ logging:
         assert service.cleanup_repository(str(test_dir)) is True
         assert not os.path.exists(test_dir)
 
+        # The renamed copy is deleted in the background
+        assert service.wait_for_cleanup(timeout=10) is True
+        assert list(tmp_path.glob("test_cleanup*")) == []
+
     def test_cleanup_nonexistent_path(self, service):
         """Test cleanup of non-existent path."""
         result = service.cleanup_repository("/nonexistent/path/12345")
@@ -157,6 +246,61 @@ logging:
             if os.path.exists(result['clone_path']):
                 shutil.rmtree(result['clone_path'])
 
+    def test_clone_repositories_keeps_order(self, service, tmp_path):
+        """Test that batched clones return one result per URL in order."""
+        # `true` stands in for git so no network is needed
+        service.config['git']['command'] = 'true'
+        urls = [
+            "https://github.com/user/repo-a",
+            "https://invalid.com/repo",
+            "https://github.com/user/repo-b",
+        ]
+
+        results = service.clone_repositories(urls)
+
+        assert [r['status'] for r in results] == ['Success', 'Failed', 'Success']
+        assert os.path.dirname(results[0]['clone_path']) == str(tmp_path / "repos")
+        assert os.path.basename(results[0]['clone_path']).startswith("user-repo-a-")
+        assert os.path.basename(results[2]['clone_path']).startswith("user-repo-b-")
+        assert 'Invalid URL format' in results[1]['error']
+
+    def test_clone_repositories_same_repo_name(self, service, tmp_path):
+        """Test that same-named repos from different owners get separate checkouts."""
+        # Records which URL was cloned into each destination, slowly enough
+        # that both clones overlap
+        fake_git = tmp_path / "fake_git"
+        fake_git.write_text(
+            '#!/bin/sh\n'
+            'eval dest=\\${$#}\n'
+            'eval url=\\${$(($# - 1))}\n'
+            'mkdir -p "$dest" && sleep 0.2 && echo "$url" > "$dest/origin"\n'
+        )
+        fake_git.chmod(0o755)
+        service.config['git']['command'] = str(fake_git)
+        urls = ["https://github.com/alice/hw", "https://github.com/bob/hw"]
+
+        results = service.clone_repositories(urls)
+
+        assert [r['status'] for r in results] == ['Success', 'Success']
+        assert results[0]['clone_path'] != results[1]['clone_path']
+        for url, result in zip(urls, results):
+            with open(os.path.join(result['clone_path'], 'origin')) as f:
+                assert f.read().strip() == url + '.git'
+
+    def test_clone_repositories_timeout(self, service, tmp_path):
+        """Test that a slow clone in a batch is killed at its timeout."""
+        slow_git = tmp_path / "slow_git"
+        slow_git.write_text("#!/bin/sh\nexec sleep 5\n")
+        slow_git.chmod(0o755)
+        service.config['git']['command'] = str(slow_git)
+
+        results = service.clone_repositories(
+            ["https://github.com/user/repo"], timeout_seconds=0.1
+        )
+
+        assert results[0]['status'] == 'Failed'
+        assert 'timed out' in results[0]['error']
+        assert results[0]['duration_seconds'] < 5
 
 class TestServiceConfiguration:
     """Test configuration handling"""
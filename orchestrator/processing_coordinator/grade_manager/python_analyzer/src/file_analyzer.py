@@ -2,23 +2,92 @@
 File analyzer module for scanning Python repositories.
 Finds and analyzes Python files according to configuration rules.
 """
+import atexit
+import multiprocessing
 import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import List, Dict
-from fnmatch import fnmatch
+from fnmatch import translate
 
 from src.line_counter import LineCounter
 
+# Below this many files a pool costs more to start than it saves
+PARALLEL_THRESHOLD = 16
+
+# One process pool for every FileAnalyzer in the process, started on first
+# use. Workers are spawned, not forked: analyses run from grade_manager's
+# threads, and a forked child could inherit a lock (the line count cache's,
+# logging's) held by another thread and deadlock.
+_PROCESS_POOL = None
+_PROCESS_POOL_LOCK = threading.Lock()
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, starting it if needed."""
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None:
+            _PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context('spawn'))
+            atexit.register(_PROCESS_POOL.shutdown)
+        return _PROCESS_POOL
+
+
+def _file_detail(line_counter: LineCounter, repository_path: str,
+                 file_path: str) -> Dict:
+    """Build one file's details; module level so process pools can pickle it."""
+    _, line_count = line_counter.count_lines(file_path)
+
+    # Get relative path for better readability
+    try:
+        relative_path = os.path.relpath(file_path, repository_path)
+    except ValueError:
+        relative_path = file_path
+
+    return {
+        "filename": relative_path,
+        "line_count": line_count,
+        "above_threshold": False  # Will be set by grading calculator
+    }
+
 
 class FileAnalyzer:
     """Analyzes Python files in a repository."""
 
     def __init__(self, file_extensions: List[str],
                  exclude_patterns: List[str],
-                 line_counter: LineCounter):
+                 line_counter: LineCounter,
+                 executor: str = "thread",
+                 parallel_threshold: int = PARALLEL_THRESHOLD):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown executor: {executor}")
+
         self.file_extensions = file_extensions
         self.exclude_patterns = exclude_patterns
         self.line_counter = line_counter
+        self.executor = executor
+        self.parallel_threshold = parallel_threshold
+        self._ext_tuple = tuple(file_extensions)
+
+        # Remove leading ** for fnmatch-style matching
+        patterns = [p.replace('**/', '').replace('**', '*') for p in exclude_patterns]
+        # Plain names such as "__pycache__" match exactly the entries with
+        # that name, so a set lookup replaces the regex for them
+        self._exclude_names = frozenset(
+            p for p in patterns if not any(c in p for c in '*?[/'))
+        patterns = [p for p in patterns if p not in self._exclude_names]
+        # A pattern matches a path if it matches the whole path or any suffix
+        # starting at a path component, so one regex covers every pattern
+        self._exclude_re = self._compile_patterns(patterns)
+        # A directory whose path plus '/' matches a pattern ending in '*'
+        # only holds excluded files, so it is not walked at all
+        self._exclude_dir_re = self._compile_patterns(
+            [p for p in patterns if p.endswith('*')])
 
     def analyze_repository(self, repository_path: str) -> List[Dict]:
         """
@@ -37,24 +106,26 @@ class FileAnalyzer:
             raise ValueError(f"Repository path is not a directory: {repository_path}")
 
         python_files = self._find_python_files(repository_path)
-        file_details = []
+        detail = partial(_file_detail, self.line_counter, repository_path)
 
-        for file_path in python_files:
-            _, line_count = self.line_counter.count_lines(file_path)
+        if len(python_files) <= self.parallel_threshold:
+            return [detail(file_path) for file_path in python_files]
 
-            # Get relative path for better readability
-            try:
-                relative_path = os.path.relpath(file_path, repository_path)
-            except ValueError:
-                relative_path = file_path
+        if self.executor == "process":
+            # CPU-bound counting of very large repositories; counts made in
+            # the workers don't reach this process's line count cache
+            return list(_process_pool().map(detail, python_files, chunksize=32))
 
-            file_details.append({
-                "filename": relative_path,
-                "line_count": line_count,
-                "above_threshold": False  # Will be set by grading calculator
-            })
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            return list(pool.map(detail, python_files))
 
-        return file_details
+    @staticmethod
+    def _compile_patterns(patterns: List[str]):
+        """Compile fnmatch patterns into one regex matched at any path component."""
+        if not patterns:
+            return None
+        alternatives = '|'.join(translate(p) for p in patterns)
+        return re.compile(r'(?s:.*/)?(?:' + alternatives + ')')
 
     def _find_python_files(self, repository_path: str) -> List[str]:
         """
@@ -64,62 +135,71 @@ class FileAnalyzer:
             repository_path: Path to the repository root
 
         Returns:
-            List of absolute paths to Python files
+            List of paths to Python files, in os.walk order
         """
         python_files = []
+        # (directory path, its path relative to the repository with '/' separators)
+        stack = [(repository_path, '')]
 
-        for root, dirs, files in os.walk(repository_path):
-            # Filter out excluded directories to prevent walking into them
-            dirs[:] = [d for d in dirs if not self._is_excluded(
-                os.path.join(root, d), repository_path)]
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            subdirs = []
 
-            for file in files:
-                file_path = os.path.join(root, file)
+            try:
+                with os.scandir(dir_path) as entries:
+                    entries = list(entries)
+            except OSError:
+                continue
+
+            for entry in entries:
+                if entry.name in self._exclude_names:
+                    continue
+                relative_path = rel_dir + entry.name
+
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    # Like os.walk, symlinked directories are not followed
+                    if not entry.is_symlink() and not self._is_excluded_dir(relative_path):
+                        subdirs.append((entry.path, relative_path + '/'))
+                    continue
 
                 # Check if file has Python extension
-                if not any(file.endswith(ext) for ext in self.file_extensions):
+                if not entry.name.endswith(self._ext_tuple):
                     continue
 
                 # Check if file matches exclusion patterns
-                if self._is_excluded(file_path, repository_path):
+                if self._is_excluded(relative_path):
                     continue
 
-                python_files.append(file_path)
+                python_files.append(entry.path)
+
+            # Depth-first, first subdirectory on top
+            stack.extend(reversed(subdirs))
 
         return python_files
 
-    def _is_excluded(self, file_path: str, repository_path: str) -> bool:
+    def _is_excluded_dir(self, relative_path: str) -> bool:
+        """Check if a directory, relative to the repository, can be skipped."""
+        if self._is_excluded(relative_path):
+            return True
+        return (self._exclude_dir_re is not None
+                and self._exclude_dir_re.match(relative_path + '/') is not None)
+
+    def _is_excluded(self, relative_path: str) -> bool:
         """
-        Check if a file path matches any exclusion pattern.
+        Check if a path matches any glob exclusion pattern.
+
+        Plain-name patterns are checked against entry names while walking.
 
         Args:
-            file_path: Absolute path to check
-            repository_path: Repository root path
+            relative_path: Path relative to the repository, '/'-separated
 
         Returns:
             True if file should be excluded
         """
-        try:
-            relative_path = os.path.relpath(file_path, repository_path)
-        except ValueError:
-            return False
-
-        # Normalize path separators for pattern matching
-        normalized_path = relative_path.replace(os.sep, '/')
-
-        for pattern in self.exclude_patterns:
-            # Remove leading ** for fnmatch
-            pattern_normalized = pattern.replace('**/', '').replace('**', '*')
-
-            # Check if pattern matches
-            if fnmatch(normalized_path, pattern_normalized):
-                return True
-
-            # Also check each path component
-            path_parts = normalized_path.split('/')
-            for i in range(len(path_parts)):
-                partial_path = '/'.join(path_parts[i:])
-                if fnmatch(partial_path, pattern_normalized):
-                    return True
-
-        return False
+        return (self._exclude_re is not None
+                and self._exclude_re.match(relative_path) is not None)
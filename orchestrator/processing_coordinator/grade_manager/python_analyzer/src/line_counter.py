@@ -2,9 +2,18 @@
 Line counter module for Python files.
 Counts lines excluding blanks, comments, and docstrings.
 """
-import re
+import os
+import threading
+from collections import OrderedDict
 from typing import Tuple
 
+# (total_raw_lines, counted_lines) by (path, mtime_ns, size, options), so an
+# unchanged file is not read again within a process
+_COUNT_CACHE: "OrderedDict[tuple, Tuple[int, int]]" = OrderedDict()
+_COUNT_CACHE_SIZE = 512
+# FileAnalyzer may count from several threads
+_COUNT_CACHE_LOCK = threading.Lock()
+
 
 class LineCounter:
     """Counts effective lines of code in Python files."""
@@ -26,17 +35,35 @@ class LineCounter:
         Returns:
             Tuple of (total_raw_lines, counted_lines)
         """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return 0, 0
+
+        key = (file_path, st.st_mtime_ns, st.st_size, self.exclude_comments,
+               self.exclude_blank_lines, self.exclude_docstrings)
+        with _COUNT_CACHE_LOCK:
+            cached = _COUNT_CACHE.get(key)
+            if cached is not None:
+                _COUNT_CACHE.move_to_end(key)
+                return cached
+
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
         except (IOError, UnicodeDecodeError) as e:
             return 0, 0
 
-        lines = content.split('\n')
-        total_raw_lines = len(lines)
+        # Same as len(content.split('\n')) without building the list
+        total_raw_lines = content.count('\n') + 1
 
         counted_lines = self._count_effective_lines(content)
 
+        with _COUNT_CACHE_LOCK:
+            _COUNT_CACHE[key] = (total_raw_lines, counted_lines)
+            if len(_COUNT_CACHE) > _COUNT_CACHE_SIZE:
+                _COUNT_CACHE.popitem(last=False)
+
         return total_raw_lines, counted_lines
 
     def _count_effective_lines(self, content: str) -> int:
@@ -53,6 +80,9 @@ class LineCounter:
         counted = 0
         in_docstring = False
         docstring_delimiter = None
+        # Triple quotes that open and close docstrings
+        triple_double = '"""'
+        triple_single = "'''"
 
         for line in lines:
             stripped = line.strip()
@@ -63,10 +93,6 @@ class LineCounter:
 
             # Check for docstring delimiters
             if self.exclude_docstrings:
-                # Check for triple quotes
-                triple_double = '"""'
-                triple_single = "'''"
-
                 if not in_docstring:
                     # Check if line starts a docstring
                     if triple_double in stripped:
@@ -2,15 +2,21 @@
 Python Analyzer Service
 Main service module that orchestrates the analysis process.
 """
+import copy
 import os
-import yaml
+import sys
 import logging
+from pathlib import Path
 from typing import Dict
 
 from src.line_counter import LineCounter
 from src.file_analyzer import FileAnalyzer
 from src.grading_calculator import GradingCalculator
 
+# Config parsing is shared with the other services (shared/utils)
+sys.path.insert(0, str(Path(__file__).resolve().parents[5] / 'shared' / 'utils'))
+from config_cache import read_yaml  # noqa: E402
+
 
 class PythonAnalyzerService:
     """Main service for analyzing Python repositories."""
@@ -23,9 +29,8 @@ class PythonAnalyzerService:
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file."""
         try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-            return config
+            # Copy so callers can't mutate the shared parse
+            return copy.deepcopy(read_yaml(config_path, 'PYTHON_ANALYZER_NO_CACHE'))
         except Exception as e:
             raise RuntimeError(f"Failed to load config: {e}")
 
@@ -66,7 +71,9 @@ class PythonAnalyzerService:
         self.file_analyzer = FileAnalyzer(
             file_extensions=analysis_config.get('file_extensions', ['.py']),
             exclude_patterns=analysis_config.get('exclude_patterns', []),
-            line_counter=self.line_counter
+            line_counter=self.line_counter,
+            executor=analysis_config.get('executor', 'thread'),
+            parallel_threshold=analysis_config.get('parallel_threshold', 16)
         )
 
         # Initialize grading calculator
@@ -3,7 +3,7 @@ import unittest
 import tempfile
 import os
 from pathlib import Path
-from src.file_analyzer import FileAnalyzer
+from src.file_analyzer import FileAnalyzer, _process_pool
 from src.line_counter import LineCounter
 
 
@@ -156,6 +156,36 @@ class TestFileAnalyzer(unittest.TestCase):
         finally:
             os.unlink(temp_path)
 
+    def test_parallel_matches_serial(self):
+        """Test that pooled counting returns the same details as serial."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(20):
+                with open(os.path.join(tmpdir, f'module{i}.py'), 'w') as f:
+                    f.write('x = 1\n' * (i + 1))
+
+            serial = self.analyzer.analyze_repository(tmpdir)
+            for executor in ('process', 'thread'):
+                analyzer = FileAnalyzer(
+                    file_extensions=['.py'],
+                    exclude_patterns=[],
+                    line_counter=self.line_counter,
+                    executor=executor,
+                    parallel_threshold=0
+                )
+                self.assertEqual(analyzer.analyze_repository(tmpdir), serial)
+
+    def test_process_pool_shared_and_spawned(self):
+        """Test process mode reuses one pool of spawned (not forked) workers."""
+        pool = _process_pool()
+        self.assertIs(_process_pool(), pool)
+        self.assertEqual(pool._mp_context.get_start_method(), 'spawn')
+        self.assertEqual(self.analyzer.executor, 'thread')
+
+    def test_unknown_executor(self):
+        """Test that an unknown executor name is rejected."""
+        with self.assertRaises(ValueError):
+            FileAnalyzer(['.py'], [], self.line_counter, executor='gpu')
+
 
 if __name__ == '__main__':
     unittest.main()
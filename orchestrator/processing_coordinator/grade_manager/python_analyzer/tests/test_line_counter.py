@@ -142,6 +142,22 @@ def function():
         self.assertEqual(total, 0)
         self.assertEqual(counted, 0)
 
+    def test_changed_file_is_recounted(self):
+        """Test that cached counts are dropped when the file changes."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write('x = 1\n')
+            temp_path = f.name
+
+        try:
+            self.assertEqual(self.counter.count_lines(temp_path)[1], 1)
+            self.assertEqual(self.counter.count_lines(temp_path)[1], 1)
+
+            with open(temp_path, 'w') as f:
+                f.write('x = 1\ny = 2\n')
+            self.assertEqual(self.counter.count_lines(temp_path)[1], 2)
+        finally:
+            os.unlink(temp_path)
+
 
 if __name__ == '__main__':
     unittest.main()
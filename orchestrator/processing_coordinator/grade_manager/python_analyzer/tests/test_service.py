@@ -4,6 +4,7 @@ import tempfile
 import os
 import yaml
 from src.service import PythonAnalyzerService
+from config_cache import _YAML_CACHE
 
 
 class TestPythonAnalyzerService(unittest.TestCase):
@@ -48,8 +49,9 @@ class TestPythonAnalyzerService(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test fixtures."""
-        if os.path.exists(self.temp_config.name):
-            os.unlink(self.temp_config.name)
+        for path in (self.temp_config.name, self.temp_config.name + '.cache.json'):
+            if os.path.exists(path):
+                os.unlink(path)
 
     def test_service_initialization(self):
         """Test that service initializes correctly."""
@@ -58,6 +60,23 @@ class TestPythonAnalyzerService(unittest.TestCase):
         self.assertIsNotNone(service.file_analyzer)
         self.assertIsNotNone(service.grading_calculator)
 
+    def test_config_json_cache(self):
+        """Test that the parsed config is cached as JSON and reused."""
+        _YAML_CACHE.clear()
+        PythonAnalyzerService(config_path=self.temp_config.name)
+        cache_path = self.temp_config.name + '.cache.json'
+        self.assertTrue(os.path.exists(cache_path))
+
+        # Edited contents invalidate the cached copy, even with an older mtime
+        self.config_data['grading']['line_threshold'] = 200
+        with open(self.temp_config.name, 'w') as f:
+            yaml.dump(self.config_data, f)
+        stat = os.stat(cache_path)
+        os.utime(self.temp_config.name, (stat.st_atime, stat.st_mtime - 10))
+
+        service = PythonAnalyzerService(config_path=self.temp_config.name)
+        self.assertEqual(service.config['grading']['line_threshold'], 200)
+
     def test_analyze_simple_repository(self):
         """Test analyzing a simple repository."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -9,9 +9,10 @@ Orchestrates repository grading by coordinating:
 
 import sys
 import os
+import csv
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import yaml
 
@@ -275,56 +276,89 @@ class GradeManagerService:
                 'failed_count': 0
             }
         
-        # Filter to only "Ready" records
-        ready_records = [
-            r for r in email_records 
-            if r.get('status') == 'Ready'
-        ]
+        return self.process_batches([email_records])
+    
+    def _failed_grade(self, record: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Grade record for a repository whose grading raised."""
+        return {
+            'email_id': record.get('email_id', 'unknown'),
+            'grade': 0.0,
+            'status': 'Failed',
+            'error': str(error)
+        }
+    
+    def process_batches(self, record_batches: Iterable[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Grade email records that arrive in batches, then write one output file.
         
-        self.logger.info(f"Processing {len(ready_records)} repositories (of {len(email_records)} total)")
+        Each batch is handed to the worker pool as soon as it arrives, so
+        cloning starts while later batches are still being read.
         
+        Args:
+            record_batches: Iterable of email record lists (may be a generator)
+            
+        Returns:
+            Dictionary with grades, output_file, graded_count, failed_count
+        """
         max_workers = self.config.get('parallelism', {}).get('max_workers', 5)
         grades = []
         
         # Process repositories (can be parallelized)
-        if max_workers > 1 and len(ready_records) > 1:
-            # Parallel processing
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {
-                    executor.submit(self.grade_single_repository, record): record
-                    for record in ready_records
-                }
+        executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+        futures = {}
+        try:
+            for email_records in record_batches:
+                # Filter to only "Ready" records
+                ready_records = [
+                    r for r in email_records 
+                    if r.get('status') == 'Ready'
+                ]
                 
-                for future in as_completed(futures):
-                    try:
-                        result = future.result()
-                        grades.append(result)
-                    except Exception as e:
-                        record = futures[future]
-                        grades.append({
-                            'email_id': record.get('email_id', 'unknown'),
-                            'grade': 0.0,
-                            'status': 'Failed',
-                            'error': str(e)
-                        })
-        else:
-            # Sequential processing
-            for record in ready_records:
-                result = self.grade_single_repository(record)
-                grades.append(result)
+                self.logger.info(f"Processing {len(ready_records)} repositories (of {len(email_records)} total)")
+                
+                if executor is None:
+                    # Sequential processing
+                    for record in ready_records:
+                        try:
+                            grades.append(self.grade_single_repository(record))
+                        except Exception as e:
+                            grades.append(self._failed_grade(record, e))
+                    continue
+                
+                # Parallel processing
+                for record in ready_records:
+                    futures[executor.submit(self.grade_single_repository, record)] = record
+            
+            for future in as_completed(futures):
+                try:
+                    grades.append(future.result())
+                except Exception as e:
+                    grades.append(self._failed_grade(futures[future], e))
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
         
         # Calculate summary
         graded_count = sum(1 for g in grades if g.get('status') == 'Ready')
         failed_count = len(grades) - graded_count
         
-        # Write to Excel if openpyxl is available
+        # Write to CSV, or to Excel if openpyxl is available
         output_file = None
+        output_config = self.config.get('output', {})
+        output_format = output_config.get('format', 'xlsx')
         try:
-            output_path = self.config.get('output', {}).get('file_path', './data/output/file_2_3.xlsx')
-            self._write_grades_to_excel(grades, output_path)
+            output_path = output_config.get('file_path', './data/output/file_2_3.xlsx')
+            if output_format == 'csv':
+                self._write_grades_to_csv(grades, output_path)
+            else:
+                self._write_grades_to_excel(grades, output_path)
             output_file = output_path
         except Exception as e:
-            self.logger.warning(f"Failed to write Excel output: {e}")
+            self.logger.warning(f"Failed to write {output_format} output: {e}")
+        
+        # Repositories were deleted in the background while grading went on
+        if self.github_cloner is not None:
+            self.github_cloner.wait_for_cleanup()
         
         self.logger.info(f"Grading complete: {graded_count} successful, {failed_count} failed")
         
@@ -346,24 +380,39 @@ class GradeManagerService:
         # Ensure output directory exists
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Grades"
+        # Write-only mode streams rows to the file instead of holding a
+        # full worksheet model in memory
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Grades")
         
         # Header
-        headers = ['email_id', 'grade', 'status']
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=1, column=col, value=header)
+        ws.append(['email_id', 'grade', 'status'])
         
         # Data rows
-        for row_idx, grade in enumerate(grades, 2):
-            ws.cell(row=row_idx, column=1, value=grade.get('email_id', ''))
-            ws.cell(row=row_idx, column=2, value=grade.get('grade', 0))
-            ws.cell(row=row_idx, column=3, value=grade.get('status', 'Failed'))
+        for grade in grades:
+            ws.append([
+                grade.get('email_id', ''),
+                grade.get('grade', 0),
+                grade.get('status', 'Failed')
+            ])
         
         wb.save(output_path)
         self.logger.info(f"Wrote {len(grades)} grades to {output_path}")
     
+    def _write_grades_to_csv(self, grades: List[Dict], output_path: str) -> None:
+        """Write grade records to CSV file."""
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['email_id', 'grade', 'status'])
+            writer.writerows(
+                (grade.get('email_id', ''), grade.get('grade', 0), grade.get('status', 'Failed'))
+                for grade in grades
+            )
+        
+        self.logger.info(f"Wrote {len(grades)} grades to {output_path}")
+    
     def health_check(self) -> Dict[str, Any]:
         """Check health of manager and child services."""
         return {
@@ -399,14 +448,19 @@ def main():
     if args.input:
         try:
             from openpyxl import load_workbook
-            wb = load_workbook(args.input)
-            ws = wb.active
-            
-            rows = list(ws.iter_rows(values_only=True))
-            headers = rows[0]
-            email_records = [
-                dict(zip(headers, row)) for row in rows[1:] if any(row)
-            ]
+            # Stream rows; read-only workbooks keep a file handle open
+            wb = load_workbook(args.input, read_only=True, data_only=True)
+            try:
+                rows = wb.active.iter_rows(values_only=True)
+                headers = next(rows, None)
+                if headers is None:
+                    print("Error: Input file is empty")
+                    return 1
+                email_records = [
+                    dict(zip(headers, row)) for row in rows if any(row)
+                ]
+            finally:
+                wb.close()
             
             print(f"Loaded {len(email_records)} records from {args.input}")
             
@@ -0,0 +1,88 @@
+"""
+Tests for the fast XLSX row reader
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from fast_xlsx import FastXlsxError, iter_xlsx_rows
+
+
+def _load_cli():
+    """Load grade_manager/__main__.py under a name that doesn't run main()."""
+    path = Path(__file__).parent.parent / "__main__.py"
+    spec = importlib.util.spec_from_file_location("grade_manager_cli", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestIterXlsxRows:
+    """Tests for iter_xlsx_rows."""
+
+    def _openpyxl_rows(self, path):
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            return [row for row in wb.active.iter_rows(values_only=True) if any(v is not None for v in row)]
+        finally:
+            wb.close()
+
+    @pytest.mark.parametrize('write_only', [False, True])
+    def test_matches_openpyxl(self, tmp_path, write_only):
+        """Test rows match what openpyxl reads for the same workbook."""
+        path = tmp_path / "emails.xlsx"
+        wb = Workbook(write_only=write_only)
+        ws = wb.create_sheet("Emails") if write_only else wb.active
+        ws.append(['email_id', 'repo_url', 'status', 'grade', 'late'])
+        ws.append(['abc123', 'https://github.com/user/repo', 'Ready', 87.5, False])
+        ws.append(['def456', None, 'Missing: repo_url', 3, True])
+        wb.save(path)
+
+        assert list(iter_xlsx_rows(str(path))) == self._openpyxl_rows(path)
+
+    def test_skipped_columns_are_none(self, tmp_path):
+        """Test cells missing from the XML are filled with None."""
+        path = tmp_path / "sparse.xlsx"
+        wb = Workbook()
+        wb.active['A1'] = 'email_id'
+        wb.active['C1'] = 'status'
+        wb.save(path)
+
+        assert list(iter_xlsx_rows(str(path))) == [('email_id', None, 'status')]
+
+    def test_not_a_workbook(self, tmp_path):
+        """Test non-XLSX input raises FastXlsxError."""
+        path = tmp_path / "emails.xlsx"
+        path.write_text("email_id,status\n")
+
+        with pytest.raises(FastXlsxError):
+            list(iter_xlsx_rows(str(path)))
+
+
+class TestIterEmailRecords:
+    """Tests for the CLI's iter_email_records with the fast reader."""
+
+    def test_short_rows_padded_to_header_width(self, tmp_path):
+        """Test trailing empty cells still appear as None in every record."""
+        path = tmp_path / "emails.xlsx"
+        wb = Workbook()
+        wb.active.append(['email_id', 'repo_url', 'status'])
+        wb.active.append(['abc123', 'https://github.com/user/repo'])
+        wb.save(path)
+
+        records = list(_load_cli().iter_email_records(str(path), fast_xlsx=True))
+        assert records == [
+            {'email_id': 'abc123', 'repo_url': 'https://github.com/user/repo', 'status': None}
+        ]
+
+    def test_empty_sheet_raises_without_fallback(self, tmp_path, capsys):
+        """Test an empty sheet is reported as such, not as a reader failure."""
+        path = tmp_path / "emails.xlsx"
+        Workbook().save(path)
+
+        with pytest.raises(ValueError, match="Input file is empty"):
+            list(_load_cli().iter_email_records(str(path), fast_xlsx=True))
+        assert "falling back" not in capsys.readouterr().out
@@ -115,3 +115,41 @@ logging:
                 
                 # Only 2 Ready records should be processed
                 assert len(result['grades']) == 2
+    
+    def test_process_writes_csv_output(self, mock_config, tmp_path):
+        """Test output.format csv writes grades as CSV."""
+        with patch('service.GitHubClonerService', None):
+            with patch('service.PythonAnalyzerService', None):
+                from service import GradeManagerService
+                service = GradeManagerService(config_path=mock_config)
+                output_path = tmp_path / "grades.csv"
+                service.config['output'] = {'file_path': str(output_path), 'format': 'csv'}
+                
+                records = [{'email_id': '1', 'repo_url': 'url1', 'status': 'Ready'}]
+                result = service.process({'email_records': records})
+                
+                assert result['output_file'] == str(output_path)
+                assert output_path.read_text().splitlines() == [
+                    'email_id,grade,status',
+                    '1,0.0,Failed'
+                ]
+    
+    def test_process_batches_writes_one_output(self, mock_config, tmp_path):
+        """Test records streamed in batches are graded and written together."""
+        with patch('service.GitHubClonerService', None):
+            with patch('service.PythonAnalyzerService', None):
+                from service import GradeManagerService
+                service = GradeManagerService(config_path=mock_config)
+                output_path = tmp_path / "grades.csv"
+                service.config['output'] = {'file_path': str(output_path), 'format': 'csv'}
+                
+                batches = (
+                    [{'email_id': str(i), 'repo_url': f'url{i}', 'status': 'Ready'}
+                     for i in range(start, start + 2)]
+                    for start in (0, 2, 4)
+                )
+                result = service.process_batches(batches)
+                
+                assert sorted(g['email_id'] for g in result['grades']) == ['0', '1', '2', '3', '4', '5']
+                assert result['failed_count'] == 6
+                assert len(output_path.read_text().splitlines()) == 7
@@ -98,3 +98,19 @@ logging:
                 
                 assert result['status'] == 'failed'
                 assert 'Unknown action' in result['error']
+    
+    def test_process_full_pipeline_without_manager(self, mock_config):
+        """Test full_pipeline action stops after failed grading."""
+        with patch('processing_coordinator.coordinator.GradeManagerService', None):
+            with patch('processing_coordinator.coordinator.FeedbackManager', None):
+                from processing_coordinator.coordinator import ProcessingCoordinator
+                coordinator = ProcessingCoordinator(config_path=mock_config)
+                
+                result = coordinator.process({
+                    'action': 'full_pipeline',
+                    'email_records': []
+                })
+                
+                assert result['action'] == 'full_pipeline'
+                assert result['status'] == 'failed'
+                assert result['feedback_result'] is None
@@ -2,7 +2,11 @@
 Tests for Shared Utilities
 """
 
+import json
+import os
+
 import pytest
+from shared.utils.config_cache import _YAML_CACHE, read_yaml, read_yaml_entry
 from shared.utils.hash_utils import sha256_hash, generate_id
 from shared.utils.validators import validate_email, validate_github_url, extract_repo_name
 
@@ -97,3 +101,51 @@ class TestValidators:
         """Test extract_repo_name returns None for invalid URL."""
         assert extract_repo_name("invalid-url") == None
         assert extract_repo_name("") == None
+
+
+class TestConfigCache:
+    """Tests for the YAML config cache."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        _YAML_CACHE.clear()
+        yield
+        _YAML_CACHE.clear()
+
+    def test_read_yaml_writes_json_copy(self, tmp_path):
+        """Test read_yaml leaves a digest-tagged JSON copy next to the file."""
+        config = tmp_path / "config.yaml"
+        config.write_text("name: first\n")
+        digest, data = read_yaml_entry(config)
+        assert data == {'name': 'first'}
+        cached = json.loads((tmp_path / "config.yaml.cache.json").read_text())
+        assert cached == {'sha256': digest, 'config': {'name': 'first'}}
+
+    def test_read_yaml_ignores_copy_for_other_contents(self, tmp_path):
+        """Test an edit is picked up even if the copy looks newer."""
+        config = tmp_path / "config.yaml"
+        json_cache = tmp_path / "config.yaml.cache.json"
+        config.write_text("name: first\n")
+        read_yaml(config)
+        _YAML_CACHE.clear()
+
+        config.write_text("name: second\n")
+        # YAML restored with an older mtime than its stale copy
+        os.utime(config, (1, 1))
+        assert read_yaml(config) == {'name': 'second'}
+        assert json.loads(json_cache.read_text())['config'] == {'name': 'second'}
+
+    def test_read_yaml_no_cache_env_skips_copy(self, tmp_path, monkeypatch):
+        """Test the opt-out variable bypasses the JSON copy."""
+        config = tmp_path / "config.yaml"
+        config.write_text("name: first\n")
+        monkeypatch.setenv('TEST_NO_CACHE', '1')
+        assert read_yaml(config, 'TEST_NO_CACHE') == {'name': 'first'}
+        assert not (tmp_path / "config.yaml.cache.json").exists()
+
+    def test_read_yaml_invalid_raises_value_error(self, tmp_path):
+        """Test malformed YAML raises ValueError."""
+        config = tmp_path / "config.yaml"
+        config.write_text("name: [unclosed\n")
+        with pytest.raises(ValueError):
+            read_yaml(config)
@@ -4,10 +4,12 @@ from shared.utils.hash_utils import sha256_hash, generate_id
 from shared.utils.validators import validate_email, validate_github_url
 from shared.utils.file_utils import read_excel, write_excel
 from shared.utils.logger import get_logger, LoggerConfig
+from shared.utils.config_cache import read_yaml, read_yaml_entry
 
 __all__ = [
     'sha256_hash', 'generate_id',
     'validate_email', 'validate_github_url',
     'read_excel', 'write_excel',
     'get_logger', 'LoggerConfig',
+    'read_yaml', 'read_yaml_entry',
 ]
@@ -0,0 +1,134 @@
+"""
+Config Cache
+
+Parses YAML config files through a JSON copy kept next to each file.
+
+The copy (config.yaml.cache.json) records the SHA-256 of the YAML it was
+built from and is only used while that digest still matches the file's
+contents, so edits are always picked up whatever the files' mtimes say.
+Services import this module directly (with shared/utils on sys.path) so
+their cold start doesn't pay for the rest of the shared package.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+# Parsed YAML by SHA-256 of the file contents, least recently used first
+_YAML_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_YAML_CACHE_SIZE = 100
+
+
+def write_json_atomic(cache_file: Path, data: Any) -> None:
+    """
+    Atomically write data as JSON next to its source.
+
+    Failures (read-only directory, values JSON can't represent) are
+    ignored: the cache only saves the next process a YAML parse.
+
+    Args:
+        cache_file: Destination path
+        data: JSON-serializable value
+    """
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_name, cache_file)
+    except (OSError, TypeError, ValueError):
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+
+
+def _parse_yaml(path: Path, data: bytes, digest: str,
+                use_json_cache: bool) -> Dict[str, Any]:
+    """Parse YAML bytes, preferring a JSON copy built from the same digest."""
+    json_cache = path.with_name(path.name + '.cache.json')
+
+    if use_json_cache:
+        try:
+            with open(json_cache, 'r') as f:
+                cached = json.load(f)
+            if cached.get('sha256') == digest:
+                return cached['config']
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+
+    # Imported here: warm starts are served from the JSON copy and never
+    # need PyYAML
+    import yaml
+    try:
+        # libyaml C binding, several times faster than the pure-Python loader
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+
+    try:
+        parsed = yaml.load(data, Loader=_YamlLoader)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML in config file: {e}")
+
+    if use_json_cache:
+        write_json_atomic(json_cache, {'sha256': digest, 'config': parsed})
+    return parsed
+
+
+def read_yaml_entry(path: Union[str, Path],
+                    no_cache_env: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    Parse a YAML file, reusing parses while its contents are unchanged.
+
+    The returned dict is shared with later callers; copy it before
+    mutating.
+
+    Args:
+        path: YAML file to read
+        no_cache_env: Environment variable that, when set, bypasses the
+            JSON copy on disk
+
+    Returns:
+        Tuple of (SHA-256 of the file contents, parsed YAML)
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If the file is not valid YAML
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+
+    parsed = _YAML_CACHE.get(digest)
+    if parsed is None:
+        use_json_cache = not (no_cache_env and os.getenv(no_cache_env))
+        parsed = _parse_yaml(path, data, digest, use_json_cache)
+        _YAML_CACHE[digest] = parsed
+        if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+            _YAML_CACHE.popitem(last=False)
+    else:
+        _YAML_CACHE.move_to_end(digest)
+    return digest, parsed
+
+
+def read_yaml(path: Union[str, Path],
+              no_cache_env: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse a YAML file; see read_yaml_entry.
+
+    Args:
+        path: YAML file to read
+        no_cache_env: Environment variable that bypasses the JSON copy
+
+    Returns:
+        Parsed YAML, shared with later callers
+    """
+    return read_yaml_entry(path, no_cache_env)[1]
@@ -46,23 +46,27 @@ def read_excel(path: str, sheet_name: Optional[str] = None) -> List[Dict[str, An
         raise FileNotFoundError(f"Excel file not found: {path}")
     
     wb = load_workbook(filename=path, read_only=True)
-    ws = wb[sheet_name] if sheet_name else wb.active
-    
-    rows = list(ws.iter_rows(values_only=True))
-    if not rows:
-        return []
-    
-    # First row is header
-    headers = [str(h) if h else f"col_{i}" for i, h in enumerate(rows[0])]
-    
-    records = []
-    for row in rows[1:]:
-        if all(cell is None for cell in row):
-            continue  # Skip empty rows
-        record = {headers[i]: cell for i, cell in enumerate(row) if i < len(headers)}
-        records.append(record)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.active
+        
+        # Iterate rows once instead of materializing the whole sheet
+        rows = ws.iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if header_row is None:
+            return []
+        
+        # First row is header
+        headers = [str(h) if h else f"col_{i}" for i, h in enumerate(header_row)]
+        
+        records = []
+        for row in rows:
+            if all(cell is None for cell in row):
+                continue  # Skip empty rows
+            record = {headers[i]: cell for i, cell in enumerate(row) if i < len(headers)}
+            records.append(record)
+    finally:
+        wb.close()
     
-    wb.close()
     logger.debug(f"Read {len(records)} records from {path}")
     return records
 
@@ -107,19 +111,16 @@ def write_excel(
         # Use keys from first record
         columns = list(records[0].keys())
     
-    wb = Workbook()
-    ws = wb.active
-    ws.title = sheet_name
+    # Write-only mode streams rows instead of building the sheet in memory
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
     
     # Write header
-    for col_idx, col_name in enumerate(columns, 1):
-        ws.cell(row=1, column=col_idx, value=col_name)
+    ws.append(columns)
     
     # Write data
-    for row_idx, record in enumerate(records, 2):
-        for col_idx, col_name in enumerate(columns, 1):
-            value = record.get(col_name)
-            ws.cell(row=row_idx, column=col_idx, value=value)
+    for record in records:
+        ws.append([record.get(col_name) for col_name in columns])
     
     wb.save(path)
     logger.info(f"Wrote {len(records)} records to {path}")